@@ -72,11 +72,10 @@ if __name__ == "__main__":
     ) 
     # 将Binder的信号传入消息处理器，以便消息处理器能通过信号与UI交互
     message_processor.set_signals(
-        response_signal=binder.emit_response_signal,
+        sentence_signal=binder.emit_sentence_signal,
         update_bubble_signal=binder.emit_update_signal,
         agent_thinking_signal=binder.emit_agent_thinking_signal,
         local_tts_state_signal=binder.emit_local_tts_state_signal,
-        expression_signal=binder.emit_expression_signal,
     ) 
 
     
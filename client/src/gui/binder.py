@@ -1,3 +1,4 @@
+import queue
 import threading
 from PySide6.QtCore import QObject, Signal
 from ..live2d import Live2dModel
@@ -17,6 +18,7 @@ class AgentBinder(QObject):
     agent_thinking_signal = Signal(bool) # 是否正在思考中
     local_tts_state_signal = Signal(str, str) # event, conv_uuid
     expression_signal = Signal(str) # Live2D expression command
+    sentence_signal = Signal(str, str, str)  # uuid, text, expression；一句回复只跨线程投递一次
 
     def __init__(
         self,
@@ -62,15 +64,25 @@ class AgentBinder(QObject):
         self.send_image_selecting_cancel_callback = send_image_selecting_cancel_callback
 
         self.msg_to_bubble: Dict[str, ChatBubble] = {}  # 用于记录消息ID和气泡的对应关系，以便后续更新气泡内容
+        # 历史记录请求由单个后台线程按顺序处理，不再每次请求都新建线程
+        self._history_requests: queue.Queue[Tuple[int, int]] = queue.Queue()
+        self._history_thread = threading.Thread(target=self._history_worker, daemon=True)
+        self._history_thread.start()
+        self._agent_thinking: bool | None = None  # 最近一次发出的思考状态
         # 将跨线程的更新请求通过 Qt 信号转发到主线程执行
         self.update_signal.connect(self._handle_update_signal)
+        self.sentence_signal.connect(self._handle_sentence_signal)
 
-    def emit_response_signal(self, uuid: str, text: str):
-        # 让QT框架外的成员能触发信号
-        self.response_signal.emit(uuid, text)
+    def emit_sentence_signal(self, uuid: str, text: str, expression: str):
+        # 让QT框架外的成员能触发信号；文本和表情合并成一次跨线程投递
+        self.sentence_signal.emit(uuid, text, expression)
 
-    def emit_expression_signal(self, expression: str):
-        self.expression_signal.emit(expression)
+    def _handle_sentence_signal(self, uuid: str, text: str, expression: str):
+        # 已在 UI 线程，下面的信号为直连调用，不再经过事件队列
+        if text:
+            self.response_signal.emit(uuid, text)
+        if expression:
+            self.expression_signal.emit(expression)
 
     def emit_update_signal(self, msg_id: str, text: str):
         '''
@@ -109,6 +121,10 @@ class AgentBinder(QObject):
         
     def emit_agent_thinking_signal(self, state: str):
         is_thinking = (state == "thinking")
+        # 服务端每个话题都会重发 thinking，状态未变时不再跨线程发信号
+        if is_thinking == self._agent_thinking:
+            return
+        self._agent_thinking = is_thinking
         self.agent_thinking_signal.emit(is_thinking)
 
     def emit_local_tts_state_signal(self, event: str, conv_uuid: str):
@@ -196,9 +212,7 @@ class AgentBinder(QObject):
         :param end_index: 结束索引（不包含），-1表示从最新开始
         """
         if self.fetch_history_callback:
-            thread = threading.Thread(target=self._fetch_history, args=(count, end_index))
-            thread.daemon = True
-            thread.start()
+            self._history_requests.put((count, end_index))
     
     def send_text_proactive(self, text: str) -> str:
         """
@@ -227,7 +241,15 @@ class AgentBinder(QObject):
     def load_history(self, count: int, end_index: int = -1):
         self.on_load_history(count, end_index)
 
+    def _history_worker(self):
+        while True:
+            count, end_index = self._history_requests.get()
+            try:
+                self._fetch_history(count, end_index)
+            except Exception as exc:
+                self.logger.error(f"Failed to fetch history: {exc}")
+
     def _fetch_history(self, count, end_index):
         if self.fetch_history_callback:
             history_data, start_index = self.fetch_history_callback(count, end_index)
-            self.history_signal.emit(history_data, start_index)
\ No newline at end of file
+            self.history_signal.emit(history_data, start_index)
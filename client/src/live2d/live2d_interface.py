@@ -21,6 +21,7 @@ class Live2dModel():
         self.model_path: str = self.model_config["model_path"]
         self.model: Optional[live2d.LAppModel] = live2d.LAppModel()
         self.model.LoadModelJson(self.model_path)
+        self._init_parameters()
         self._init_expression()
         self._init_motion()
         self._init_hit_areas()
@@ -33,6 +34,13 @@ class Live2dModel():
         self.model.SetScale(self.model_config.get("scale", 1.5))
 
     # Belows are init functions
+    def _init_parameters(self) -> None:
+        # 参数 ID -> 下标只建一次；口型每秒写入 60 次，避免每次都按名字查找
+        self.param_index: Dict[str, int] = {pid: i for i, pid in enumerate(self.model.GetParamIds())}
+        self._mouth_open_index: Optional[int] = self.param_index.get("ParamMouthOpenY")
+        # 部分 live2d-py 版本支持按下标写参数，不支持时回退到按 ID 写入
+        self._set_param_by_index = getattr(self.model, "SetIndexParamValue", None)
+
     def _init_expression(self) -> None:
         # 处理表情数据
         self.expression_list: List[str] = self.model.GetExpressionIds()
@@ -141,15 +149,17 @@ class Live2dModel():
     
     def SetMouthOpenValue(self, value: float, weight: float = 1.0) -> None:
         if self.model:
-            self.model.SetParameterValue("ParamMouthOpenY", value, weight)
+            if self._set_param_by_index is not None and self._mouth_open_index is not None:
+                self._set_param_by_index(self._mouth_open_index, value, weight)
+            else:
+                self.model.SetParameterValue("ParamMouthOpenY", value, weight)
 
     def GetParameterValue(self, paramId: str | int) -> float:
         if self.model:
             if isinstance(paramId, int):
                 return self.model.GetParameterValue(paramId)
-            ids = self.model.GetParamIds()
-            if paramId in ids:
-                index = ids.index(paramId)
+            index = self.param_index.get(paramId)
+            if index is not None:
                 return self.model.GetParameterValue(index)
         return 0.0
 
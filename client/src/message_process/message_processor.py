@@ -36,11 +36,10 @@ class MessageProcessor:
         self._listener_thread = threading.Thread(target=self._listen_ws_events, daemon=True) # 处理WS消息的线程
         self._sender_thread = threading.Thread(target=self._send_loop, daemon=True) # 处理发送消息的线程
         self.model: Live2dModel | None = None # Live2D模型实例，用于根据消息中的表情指令更新模型表情
-        self.response_signal: Callable[[str, str], None] | None = None # 为ui增加一条回复信息
+        self.sentence_signal: Callable[[str, str, str], None] | None = None # 为ui增加一条回复信息并更新Live2D表情，参数为uuid、文本、表情
         self.update_bubble_signal: Callable[[str, str], None] | None = None # 更新气泡信息
         self.agent_thinking_signal: Callable[[bool], None] | None = None # 显示agent正在思考的状态
         self.local_tts_state_signal: Callable[[str, str], None] | None = None # 本地TTS状态变化的回调信号，参数为事件类型（start/finish）和对应的conv_uuid
-        self.expression_signal: Callable[[str], None] | None = None # Live2D表情更新信号
 
         self._reply_counter = 0
         self._running = True
@@ -214,11 +213,9 @@ class MessageProcessor:
             self.processing_uuid = response.uuid
             self.processing_audio = bytearray()
 
-        if display_in_chat and response.text:
-            self.response_signal(response.uuid, response.text)
-
-        if response.expression and self.expression_signal:
-            self.expression_signal(response.expression)
+        text = response.text if display_in_chat else ""
+        if (text or response.expression) and self.sentence_signal:
+            self.sentence_signal(response.uuid, text or "", response.expression or "")
 
         if response.audio:
             self.multimedia_stream.feed(response.audio)
@@ -229,8 +226,8 @@ class MessageProcessor:
                 self.logger.error(f"Failed to decode audio chunk (uuid={response.uuid}): {exc}")
 
         if response.is_final_package:
-            self.multimedia_stream.finish_one_sentense()
-            # 将最终的音频结果保存到本地
+            # 将最终的音频结果保存到本地。先于 finish_one_sentense 执行：
+            # 后者会阻塞到整句播放完毕，气泡的重播按钮不必等这么久
             saved_uuid = self.processing_uuid
             ret = self._save_audio_to_temp(self.processing_audio, saved_uuid, ".wav")
             self.processing_audio = bytearray()
@@ -241,6 +238,7 @@ class MessageProcessor:
                     self.update_bubble_signal(saved_uuid, "has_audio")
                 except Exception as exc:
                     self.logger.error(f"Failed to emit update_bubble_signal for audio (uuid={saved_uuid}): {exc}")
+            self.multimedia_stream.finish_one_sentense()
 
     def _send_loop(self):
         while self._running:
@@ -285,17 +283,15 @@ class MessageProcessor:
 
     def set_signals(
         self,
-        response_signal: Callable[[str, str], None],
+        sentence_signal: Callable[[str, str, str], None],
         update_bubble_signal: Callable[[str, str], None],
         agent_thinking_signal: Callable[[str], None],
         local_tts_state_signal: Callable[[str, str], None] | None = None,
-        expression_signal: Callable[[str], None] | None = None,
     ):
-        self.response_signal = response_signal
+        self.sentence_signal = sentence_signal
         self.update_bubble_signal = update_bubble_signal
         self.agent_thinking_signal = agent_thinking_signal
         self.local_tts_state_signal = local_tts_state_signal
-        self.expression_signal = expression_signal
 
     def _on_local_tts_state(self, event: str, conv_uuid: str):
         if self.local_tts_state_signal:
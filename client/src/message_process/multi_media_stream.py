@@ -1,4 +1,5 @@
 import multiprocessing
+import numpy as np
 import soundfile as sf
 import io
 import queue
@@ -10,7 +11,7 @@ from dataclasses import dataclass
 from typing import Callable
 from ..utils.logger import get_logger
 from ..utils.audio_processor import (
-    extract_audio_amplitude,
+    samples_to_amplitude,
     decode_from_base64,
     AudioPlayerStream,
     calculate_amplitude_from_chunk,
@@ -260,43 +261,49 @@ class MultiMediaStream:
 
 
     def _mouth_move_stream(self, init_value, mouth_queue: queue.Queue, stop_event: threading.Event, fps=60):
+        # 停止时 _close_audio_stream 会先置位 stop_event 再放入 None，阻塞的 get 和帧间等待都会立即返回
+        set_mouth = self.model.SetMouthOpenValue if self.model else None  # 循环外取一次绑定方法
         while not stop_event.is_set():
-            try:
-                amps = mouth_queue.get(timeout=0.05)
-                if amps is None:
+            amps = mouth_queue.get()
+            if amps is None:
+                break
+
+            # We have a chunk of amplitudes (frames)
+            # 先整体转成 Python float 列表，逐帧取值时不再产生 numpy 标量再转给 live2d 绑定
+            amps = np.asarray(amps, dtype=np.float64).tolist()
+            # 帧 i 的时间点固定为 start_time + i / fps：每次只睡到下一帧的时间点，
+            # 不会累积漂移；落后时按实际耗时取帧，直接丢掉错过的帧
+            start_time = time.monotonic()
+            duration = len(amps) / fps
+            while True:
+                elapsed = time.monotonic() - start_time
+                if elapsed >= duration:
                     break
-                
-                # We have a chunk of amplitudes (frames)
-                start_time = time.time()
-                while True:
-                    elapesed = time.time() - start_time
-                    if elapesed >= len(amps) / fps:
-                        break
-                    goal_idx = int(elapesed * fps)
-                    target_val = amps[goal_idx]
-                    if self.model:
-                        self.model.SetParameterValue("ParamMouthOpenY", target_val, weight=0.3)
-                    time.sleep(1 / fps)
-
-            except queue.Empty:
-                continue
-                
-        if self.model:
-            self.model.SetParameterValue("ParamMouthOpenY", init_value, weight=1)
+                goal_idx = int(elapsed * fps)
+                if set_mouth is not None:
+                    set_mouth(amps[goal_idx], 0.3)
+                next_deadline = start_time + (goal_idx + 1) / fps
+                if stop_event.wait(max(0.0, next_deadline - time.monotonic())):
+                    break
+
+        if set_mouth is not None:
+            set_mouth(init_value, 1)
 
     def _append_audio_stream(self, audio_data: bytes):
         self._open_audio_stream_if_needed()
         amps = []
         if self.local_audio_properties.is_first_audio:
+            # 首包只解码一次：同一个 SoundFile 既取流参数，也读出采样来算口型振幅
             try:
                 with sf.SoundFile(io.BytesIO(audio_data)) as f:
                     self.local_audio_properties.samplerate = f.samplerate
                     self.local_audio_properties.channels = f.channels
                     self.local_audio_properties.subtype = f.subtype
+                    samples = f.read()
+                amps = samples_to_amplitude(samples, self.local_audio_properties.samplerate, fps=60)
             except Exception as exc:
                 self.logger.error(f"Header parse error: {exc}")
-
-            amps = extract_audio_amplitude(audio_data, fps=60)
+                amps = np.array([0.0])
             self.local_audio_properties.is_first_audio = False
         elif self.local_audio_properties.samplerate > 0:
             amps = calculate_amplitude_from_chunk(
@@ -329,6 +336,8 @@ class MultiMediaStream:
 
         if self._stop_mouth_event:
             self._stop_mouth_event.set()
+        if self._mouth_queue is not None:
+            self._mouth_queue.put(None)
         if self._mouth_thread:
             self._mouth_thread.join(timeout=1.0)
 
@@ -102,6 +102,21 @@ def extract_audio_amplitude(wav: str | bytes, fps: int = 30) -> np.ndarray:
         logger.error(f"Failed to load audio with soundfile: {e}")
         return np.array([0.0])
 
+    return samples_to_amplitude(y, sr, fps)
+
+
+def samples_to_amplitude(y: np.ndarray, sr: int, fps: int = 30) -> np.ndarray:
+    """
+    由已解码的采样计算口型振幅，供已经持有采样数据的调用方复用，避免再解码一次。
+
+    Args:
+        y: 采样数组，形状为 (n,) 或 (n, channels)
+        sr: 采样率
+        fps: 每秒采样的帧数
+
+    Returns:
+        numpy.ndarray: 归一化后的振幅数组，值范围 [0, 1]
+    """
     # 如果是多声道，取平均值转为单声道
     if y.ndim > 1:
         y = np.mean(y, axis=1)
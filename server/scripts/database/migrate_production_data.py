@@ -5,6 +5,7 @@ import shutil
 import sqlite3
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -339,6 +340,30 @@ def _migrate_sql_tables(prod_snapshot_db: Path, target_db: Path) -> dict[str, in
         target.close()
 
 
+def _copytree_parallel(source: Path, target: Path, max_workers: int = 8) -> None:
+    """Equivalent of shutil.copytree(source, target) that copies files on a thread pool.
+
+    Copies are real copies (no hardlinks) because the target is mutated afterwards
+    and must never alias the production snapshot or the backup.
+    """
+    target.mkdir(parents=True, exist_ok=False)
+    directories: list[tuple[Path, Path]] = [(source, target)]
+    files: list[tuple[Path, Path]] = []
+    for root, dir_names, file_names in os.walk(source, followlinks=True):
+        root_path = Path(root)
+        target_root = target / root_path.relative_to(source)
+        for name in dir_names:
+            (target_root / name).mkdir()
+            directories.append((root_path / name, target_root / name))
+        files.extend((root_path / name, target_root / name) for name in file_names)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # list() re-raises the first copy error, like shutil.copytree would.
+        list(executor.map(lambda pair: shutil.copy2(*pair), files))
+    for source_dir, target_dir in reversed(directories):
+        shutil.copystat(source_dir, target_dir)
+
+
 def _replace_directory(source: Path, target: Path, local_data: Path) -> None:
     _ensure_inside(target, local_data)
     if not source.exists():
@@ -347,7 +372,7 @@ def _replace_directory(source: Path, target: Path, local_data: Path) -> None:
     target.parent.mkdir(parents=True, exist_ok=True)
     if target.exists():
         shutil.rmtree(target)
-    shutil.copytree(source, target)
+    _copytree_parallel(source, target)
 
 
 def _replace_production_directories(prod_data: Path, local_data: Path) -> None:
@@ -361,7 +386,7 @@ def _backup_local_data(local_data: Path, backup_root: Path) -> Path:
     if backup_dir.exists():
         raise RuntimeError(f"Backup directory already exists: {backup_dir}")
     backup_dir.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copytree(local_data, backup_dir)
+    _copytree_parallel(local_data, backup_dir)
     return backup_dir
 
 
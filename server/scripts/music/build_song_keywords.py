@@ -2,8 +2,9 @@ import argparse
 import json
 import re
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Optional
 
 
 LEFT_TO_RIGHT = {
@@ -135,32 +136,37 @@ def extract_string_values(value) -> Iterable[str]:
             yield from extract_string_values(item)
 
 
-def collect_keywords(song_dir: Path) -> tuple[set[str], dict[str, set[str]]]:
+def load_song_json(json_file: Path) -> Optional[dict]:
+    """Read one song json; None for unreadable/broken files."""
+    try:
+        with json_file.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+def collect_keywords(song_dir: Path, workers: int = 16) -> tuple[set[str], dict[str, set[str]]]:
     """Collect song-name keywords and lyric keywords mapped to source song names."""
     song_names: set[str] = set()
     lyric_to_songs: dict[str, set[str]] = {}
 
     json_files = sorted(song_dir.glob("*.json"))
-    for json_file in json_files:
-        # 1) Song name keyword from file stem
-        song_name = json_file.stem.strip()
-        if song_name:
-            song_names.add(song_name)
-
-        # 2) Lyric keywords from json['lyrics'] when it contains strings
-        try:
-            with json_file.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-        except Exception:
-            # Skip unreadable/broken json files
-            continue
-
-        if not isinstance(data, dict) or "lyrics" not in data:
-            continue
-
-        for lyrics_text in extract_string_values(data.get("lyrics")):
-            for kw in extract_lyric_keywords(lyrics_text):
-                lyric_to_songs.setdefault(kw, set()).add(song_name)
+    # File reads dominate; overlap them in threads. map() keeps the sorted order,
+    # and all aggregation stays on this thread.
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for json_file, data in zip(json_files, executor.map(load_song_json, json_files)):
+            # 1) Song name keyword from file stem
+            song_name = json_file.stem.strip()
+            if song_name:
+                song_names.add(song_name)
+
+            # 2) Lyric keywords from json['lyrics'] when it contains strings
+            if not isinstance(data, dict) or "lyrics" not in data:
+                continue
+
+            for lyrics_text in extract_string_values(data.get("lyrics")):
+                for kw in extract_lyric_keywords(lyrics_text):
+                    lyric_to_songs.setdefault(kw, set()).add(song_name)
 
     return song_names, lyric_to_songs
 
@@ -206,12 +212,18 @@ def main() -> None:
         default=Path("res") / "knowledge" / "song_lyric_keywords.txt",
         help="Output txt path for lyric keywords with source songs",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=16,
+        help="Threads used to read song json files",
+    )
     args = parser.parse_args()
 
     if not args.song_dir.exists() or not args.song_dir.is_dir():
         raise SystemExit(f"song-dir does not exist or is not a directory: {args.song_dir}")
 
-    song_names, lyric_to_songs = collect_keywords(args.song_dir)
+    song_names, lyric_to_songs = collect_keywords(args.song_dir, args.workers)
     write_song_names(args.song_output, song_names)
     write_lyric_keywords_with_source(args.lyric_output, lyric_to_songs)
 
@@ -5,7 +5,7 @@
 """
 from __future__ import annotations
 
-from typing import  List, Dict, Any, Optional, Tuple, Generator
+from typing import  AsyncGenerator, List, Dict, Any, Optional, Tuple, Generator
 import json
 import re
 from typing import TYPE_CHECKING
@@ -125,12 +125,23 @@ class LuoTianyiAgent:
         plan: TopicAttentionPlan,
     ) -> List[OneResponseLine]:
         """Realize a conscious plan into legacy response line objects."""
-        user_context = self._load_user_expression_context(user_id)
         return await self.response_realizer.realize_topic_plan(
             plan=plan,
-            user_context=user_context,
+            user_context=self._load_user_expression_context(user_id),
         )
 
+    async def realize_topic_plan_stream_for_pipeline(
+        self,
+        user_id: str,
+        plan: TopicAttentionPlan,
+    ) -> AsyncGenerator[OneResponseLine, None]:
+        """Same as realize_topic_plan_for_pipeline, but yields lines while the LLM is still generating."""
+        async for item in self.response_realizer.realize_topic_plan_stream(
+            plan=plan,
+            user_context=self._load_user_expression_context(user_id),
+        ):
+            yield item
+
     async def _search_fact_constraints_for_topic(self, fact_constraints: List[str]) -> List[str]:
         return await self.mind.search_fact_constraints_for_topic(fact_constraints)
 
@@ -2,11 +2,11 @@ from __future__ import annotations
 
 import json
 from abc import ABC, abstractmethod
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
 
-from src.agent.prompt_assembly import RealizationPromptAssembler
+from src.agent.prompt_assembly import RealizationPromptAssembler, RealizationPromptInput
 from src.agent.response_parser import StructuredResponseParser
 from src.agent.text_cleaning import build_sound_content
 from src.domain import CharacterProfile
@@ -15,7 +15,8 @@ from src.utils.llm.llm_module import LLMModule
 from src.utils.logger import get_logger
 
 
-@dataclass
+# 每句回复都会实例化一次；slots 省掉实例 __dict__。父类也要 slots，否则子类仍带 __dict__
+@dataclass(slots=True)
 class OneResponseLine(ABC):
     type: ContextType
     uuid: str = ""
@@ -25,7 +26,7 @@ class OneResponseLine(ABC):
         raise NotImplementedError("Subclasses of OneResponseLine must implement get_content()")
 
 
-@dataclass
+@dataclass(slots=True)
 class SongSegmentChat(OneResponseLine):
     type: ContextType = ContextType.SING
     lyrics: str = ""
@@ -37,7 +38,7 @@ class SongSegmentChat(OneResponseLine):
         return f"唱了《{self.song}》"
 
 
-@dataclass
+@dataclass(slots=True)
 class OneSentenceChat(OneResponseLine):
     type: ContextType = ContextType.TEXT
     sound_content: str = ""
@@ -85,7 +86,74 @@ class MainChat:
         memory_hits: Optional[List[str]] = None,
         sing_plan: Optional[Tuple[str, str]] = None,
     ) -> List[OneResponseLine]:
-        prompt_input = self.prompt_assembler.build(
+        prompt_input = self._build_prompt_input(
+            reply_topic,
+            user_nickname,
+            user_description,
+            preference_context=preference_context,
+            conversation_history=conversation_history,
+            fact_hits=fact_hits,
+            memory_hits=memory_hits,
+            sing_plan=sing_plan,
+        )
+        response = await self._call_llm(**prompt_input.to_dict())
+        return self._parse_response(response, sing_plan)
+
+    async def generate_response_stream(
+        self,
+        reply_topic: str,
+        user_nickname: str,
+        user_description: str,
+        sing_plan: Optional[Tuple[str, str]] = None,
+        **prompt_context: Any,
+    ) -> AsyncGenerator[OneResponseLine, None]:
+        """与 generate_response 相同（其余参数原样交给 _build_prompt_input），但 LLM 每输出完整一行
+        就产出该行的回复，下游可以在后续句子还在生成时就开始合成第一句。"""
+        prompt_input = self._build_prompt_input(
+            reply_topic, user_nickname, user_description, sing_plan=sing_plan, **prompt_context
+        )
+        pending = ""
+        received = False
+        structured_found = False
+        try:
+            async for delta in self.llm.generate_response_stream(**prompt_input.to_dict()):
+                received = received or bool(delta.strip())
+                *lines, pending = (pending + delta).split("\n")
+                for line in lines:
+                    item = self.response_parser.parse_line(line, sing_plan)
+                    if item is not None:
+                        structured_found = True
+                        yield item
+        except Exception as e:
+            import traceback
+
+            self.logger.error(f"Error during topic reply generation: {e}\n{traceback.format_exc()}")
+            # 中断时最后一行可能是半句，丢弃
+            pending = ""
+
+        item = self.response_parser.parse_line(pending, sing_plan)
+        if item is not None:
+            structured_found = True
+            yield item
+
+        if not structured_found:
+            if received:
+                self.logger.warning("No structured format detected in LLM response, returning an empty text.")
+            yield self.default_response
+
+    def _build_prompt_input(
+        self,
+        reply_topic: str,
+        user_nickname: str,
+        user_description: str,
+        preference_context: str = "",
+        conversation_history: str = "",
+        fact_hits: Optional[List[str]] = None,
+        memory_hits: Optional[List[str]] = None,
+        sing_plan: Optional[Tuple[str, str]] = None,
+    ) -> RealizationPromptInput:
+        """整理一次回复的 prompt 变量，整句生成和流式生成共用"""
+        return self.prompt_assembler.build(
             character_name=self.character_name,
             character_persona=self.character_persona,
             speaking_style=self.speaking_style,
@@ -98,8 +166,6 @@ class MainChat:
             memory_hits=memory_hits,
             sing_plan=sing_plan,
         )
-        response = await self._call_llm(**asdict(prompt_input))
-        return self._parse_response(response, sing_plan)
 
     async def _call_llm(self, **kwargs) -> str:
         try:
@@ -1,11 +1,23 @@
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
+# (epoch second, formatted string): prompts only carry second resolution,
+# so one strftime per second is shared by every prompt built in it.
+_TIME_CACHE: list = [0, ""]
 
-@dataclass(frozen=True)
+
+def _now_str() -> str:
+    now = int(time.time())
+    if now != _TIME_CACHE[0]:
+        _TIME_CACHE[:] = [now, datetime.fromtimestamp(now).strftime("%Y-%m-%d %H:%M:%S")]
+    return _TIME_CACHE[1]
+
+
+@dataclass(frozen=True, slots=True)
 class RealizationPromptInput:
     character_name: str
     character_persona: str
@@ -18,6 +30,21 @@ class RealizationPromptInput:
     sing_requirement: str
     extra_knowledge: str
 
+    def to_dict(self) -> dict[str, str]:
+        """Prompt variables as a plain dict; avoids dataclasses.asdict's recursive deepcopy."""
+        return {
+            "character_name": self.character_name,
+            "character_persona": self.character_persona,
+            "speaking_style": self.speaking_style,
+            "user_persona": self.user_persona,
+            "preference_context": self.preference_context,
+            "conversation_history": self.conversation_history,
+            "current_time": self.current_time,
+            "reply_topic": self.reply_topic,
+            "sing_requirement": self.sing_requirement,
+            "extra_knowledge": self.extra_knowledge,
+        }
+
 
 class RealizationPromptAssembler:
     """Builds prompt variables for the current MainChat realization backend."""
@@ -44,7 +71,7 @@ class RealizationPromptAssembler:
             user_persona=self.build_user_persona(user_nickname, user_description),
             preference_context=preference_context,
             conversation_history=conversation_history or "无",
-            current_time=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            current_time=_now_str(),
             reply_topic=reply_topic or "",
             sing_requirement=self.build_sing_requirement(sing_plan),
             extra_knowledge=self.build_extra_knowledge(fact_hits or [], memory_hits or []),
@@ -47,28 +47,10 @@ class StructuredResponseParser:
         structured_found = False
 
         for raw_line in text.splitlines():
-            line = raw_line.strip()
-            if not line:
-                continue
-
-            sing_match = self.sing_pattern.match(line)
-            if self.logger:
-                self.logger.debug(f"Parsing line: '{line}'")
-            if sing_match:
-                if sing_plan:
-                    item = self._parse_sing_line(sing_match.group(1), sing_plan)
-                    if item is not None:
-                        results.append(item)
-                        structured_found = True
-                continue
-
-            tone_match = self.tone_pattern.match(line)
-            if tone_match:
-                item = self._parse_tone_line(tone_match.group(1), tone_match.group(2))
-                if item is not None:
-                    results.append(item)
-                    structured_found = True
-                continue
+            item = self.parse_line(raw_line, sing_plan)
+            if item is not None:
+                results.append(item)
+                structured_found = True
 
         if structured_found:
             return results or [self.default_response]
@@ -77,6 +59,29 @@ class StructuredResponseParser:
             self.logger.warning("No structured format detected in LLM response, returning an empty text.")
         return [self.default_response]
 
+    def parse_line(
+        self,
+        raw_line: str,
+        sing_plan: Optional[tuple[str, str]],
+    ) -> Optional["OneResponseLine"]:
+        """解析单行回复；非结构化或无效的行返回 None。流式回复逐行调用"""
+        line = raw_line.strip()
+        if not line:
+            return None
+
+        sing_match = self.sing_pattern.match(line)
+        if self.logger:
+            self.logger.debug(f"Parsing line: '{line}'")
+        if sing_match:
+            if sing_plan:
+                return self._parse_sing_line(sing_match.group(1), sing_plan)
+            return None
+
+        tone_match = self.tone_pattern.match(line)
+        if tone_match:
+            return self._parse_tone_line(tone_match.group(1), tone_match.group(2))
+        return None
+
     def _strip_code_fence(self, response: str) -> str:
         text = response.strip()
         if text.startswith("```") and text.endswith("```"):
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, AsyncGenerator
 
 if TYPE_CHECKING:
     from src.agent.main_chat import MainChat, OneResponseLine
@@ -27,13 +27,27 @@ class ResponseRealizer:
         plan: "TopicAttentionPlan",
         user_context: UserExpressionContext,
     ) -> list["OneResponseLine"]:
-        return await self.main_chat.generate_response(
-            reply_topic=plan.topic_content,
-            user_nickname=user_context.nickname,
-            user_description=user_context.description,
-            preference_context=user_context.preference_context,
-            conversation_history=plan.conversation_history,
-            fact_hits=plan.fact_hits,
-            memory_hits=plan.memory_hits,
-            sing_plan=plan.sing_plan,
-        )
+        return await self.main_chat.generate_response(**self._generation_kwargs(plan, user_context))
+
+    async def realize_topic_plan_stream(
+        self,
+        *,
+        plan: "TopicAttentionPlan",
+        user_context: UserExpressionContext,
+    ) -> AsyncGenerator["OneResponseLine", None]:
+        async for item in self.main_chat.generate_response_stream(**self._generation_kwargs(plan, user_context)):
+            yield item
+
+    @staticmethod
+    def _generation_kwargs(plan: "TopicAttentionPlan", user_context: UserExpressionContext) -> dict:
+        """MainChat.generate_response / generate_response_stream 共用的参数"""
+        return {
+            "reply_topic": plan.topic_content,
+            "user_nickname": user_context.nickname,
+            "user_description": user_context.description,
+            "preference_context": user_context.preference_context,
+            "conversation_history": plan.conversation_history,
+            "fact_hits": plan.fact_hits,
+            "memory_hits": plan.memory_hits,
+            "sing_plan": plan.sing_plan,
+        }
@@ -168,6 +168,12 @@ class AgentRuntime:
         runtime = self.get_character_runtime(character_id)
         return await runtime.conscious.realize_topic_plan_for_pipeline(user_id=user_id, plan=plan)
 
+    async def realize_topic_plan_stream(self, *, character_id: str | None, user_id: str, plan: Any):
+        """与 realize_topic_plan 相同，但随 LLM 输出逐条产出回复。"""
+        runtime = self.get_character_runtime(character_id)
+        async for item in runtime.conscious.realize_topic_plan_stream_for_pipeline(user_id=user_id, plan=plan):
+            yield item
+
     async def write_topic_memories(
         self,
         *,
@@ -8,10 +8,18 @@ from src.domain.music_type import SongSegment, SongMetadata, OneLyricLine, WishE
 from src.domain.tool_type import  MyTool, ToolFunction, ToolOneParameter
 from typing import List, Tuple, Dict, Any, Optional
 import random
+from functools import lru_cache
 from src.world.learn_sing_songs.auto_song_learner import WishlistManager
 from src.utils.helpers import get_unified_song_name
 
 
+@lru_cache(maxsize=1024)
+def _load_song_config(config_path: str, mtime: float) -> Dict[str, Any]:
+    """读取歌曲配置 JSON。以 (路径, mtime) 为键缓存，reload_songs 重新扫描时未改动的文件只需一次 stat"""
+    with open(config_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
 class SingingManager:
     def __init__(self, config: Dict[str, Any]):
         self.logger = get_logger(__name__)
@@ -62,8 +70,7 @@ class SingingManager:
 
             # 读取配置文件
             try:
-                with open(config_file, "r", encoding="utf-8") as f:
-                    song_config = json.load(f)
+                song_config = _load_song_config(str(config_file), config_file.stat().st_mtime)
                 title = song_config.get("title", song)
                 description = song_config.get("description", "")
                 lrc_offset = song_config.get("lrc_offset", 0)
@@ -1,14 +1,15 @@
 import io
 import os
-import time
 import atexit
 import gc
 import logging
 import sys
 import traceback
 import multiprocessing
+import queue
+import threading
 from queue import Empty
-from typing import Any, Dict, Generator, Optional
+from typing import Any, Dict, Generator, Optional, Tuple
 from multiprocessing.queues import Queue as MPQueue
 from multiprocessing.synchronize import Event as MPEvent
 
@@ -330,7 +331,11 @@ class TTSServer:
         self.ready_event: Optional[MPEvent] = None
         self.stop_event: Optional[MPEvent] = None
         self._request_counter = 0
-        self._synthesize_lock = multiprocessing.Lock()
+        self._synthesize_lock = threading.Lock()
+        # request_id -> 该请求专属的响应队列，由 _dispatch_responses 线程投递，调用方阻塞等待，无需轮询
+        self._pending: Dict[str, queue.Queue] = {}
+        self._pending_lock = threading.Lock()
+        self._dispatcher_thread: Optional[threading.Thread] = None
 
     def _info(self, message: str) -> None:
         if not self.quiet_logs:
@@ -373,6 +378,14 @@ class TTSServer:
             self.stop(force=True)
             raise RuntimeError("Failed to start gsv_tts worker")
 
+        self._dispatcher_thread = threading.Thread(
+            target=self._dispatch_responses,
+            args=(self.server_process, self.response_queue, self.stop_event),
+            name="TTSResponseDispatcher",
+            daemon=True,
+        )
+        self._dispatcher_thread.start()
+
         self._info("gsv_tts worker started successfully")
 
         # Ensure cleanup on main process exit
@@ -401,6 +414,11 @@ class TTSServer:
 
         self.server_process = None
 
+        if self._dispatcher_thread is not None:
+            self._dispatcher_thread.join(timeout=2)
+            self._dispatcher_thread = None
+        self._fail_pending("gsv_tts worker stopped")
+
         if self.request_queue is not None:
             try:
                 self.request_queue.close()
@@ -434,29 +452,27 @@ class TTSServer:
         if not self.request_queue or not self.response_queue:
             raise RuntimeError("gsv_tts worker queues are not initialized")
 
-        with self._synthesize_lock:
-            self._request_counter += 1
-            request_id = f"req-{self._request_counter}"
-
-            self.request_queue.put(
-                {
-                    "command": "synthesize",
-                    "request_id": request_id,
-                    "text": text,
-                    "spk_audio_path": spk_audio_path,
-                    "prompt_audio_path": prompt_audio_path,
-                    "prompt_audio_text": prompt_audio_text,
-                }
-            )
-
-            response = self._wait_for_response(request_id=request_id, timeout=timeout)
-            if not response.get("ok"):
-                error = response.get("error", "unknown error")
-                tb = response.get("traceback")
-                if tb:
-                    self.logger.error(f"gsv_tts synthesize failed: {error}\n{tb}")
-                raise RuntimeError(f"gsv_tts synthesize failed: {error}")
-            return response.get("audio_bytes", b"")
+        request_id, response_box = self._submit(
+            {
+                "command": "synthesize",
+                "text": text,
+                "spk_audio_path": spk_audio_path,
+                "prompt_audio_path": prompt_audio_path,
+                "prompt_audio_text": prompt_audio_text,
+            }
+        )
+        try:
+            response = self._wait_for_response(request_id, response_box, timeout)
+        finally:
+            self._release(request_id)
+
+        if not response.get("ok"):
+            error = response.get("error", "unknown error")
+            tb = response.get("traceback")
+            if tb:
+                self.logger.error(f"gsv_tts synthesize failed: {error}\n{tb}")
+            raise RuntimeError(f"gsv_tts synthesize failed: {error}")
+        return response.get("audio_bytes", b"")
 
     def stream_synthesize(
         self,
@@ -472,23 +488,18 @@ class TTSServer:
         if not self.request_queue or not self.response_queue:
             raise RuntimeError("gsv_tts worker queues are not initialized")
 
-        with self._synthesize_lock:
-            self._request_counter += 1
-            request_id = f"req-{self._request_counter}"
-
-            self.request_queue.put(
-                {
-                    "command": "stream_synthesize",
-                    "request_id": request_id,
-                    "text": text,
-                    "spk_audio_path": spk_audio_path,
-                    "prompt_audio_path": prompt_audio_path,
-                    "prompt_audio_text": prompt_audio_text,
-                }
-            )
-
+        request_id, response_box = self._submit(
+            {
+                "command": "stream_synthesize",
+                "text": text,
+                "spk_audio_path": spk_audio_path,
+                "prompt_audio_path": prompt_audio_path,
+                "prompt_audio_text": prompt_audio_text,
+            }
+        )
+        try:
             while True:
-                response = self._wait_for_response(request_id=request_id, timeout=timeout)
+                response = self._wait_for_response(request_id, response_box, timeout)
                 if not response.get("ok"):
                     error = response.get("error", "unknown error")
                     tb = response.get("traceback")
@@ -502,6 +513,57 @@ class TTSServer:
 
                 if response.get("is_final"):
                     break
+        finally:
+            self._release(request_id)
+
+    def _submit(self, message: Dict[str, Any]) -> Tuple[str, queue.Queue]:
+        """登记请求专属的响应队列后再发给 worker，避免响应先于登记到达"""
+        response_box: queue.Queue = queue.Queue()
+        with self._synthesize_lock:
+            self._request_counter += 1
+            request_id = f"req-{self._request_counter}"
+            with self._pending_lock:
+                self._pending[request_id] = response_box
+            self.request_queue.put({**message, "request_id": request_id})
+        return request_id, response_box
+
+    def _release(self, request_id: str) -> None:
+        with self._pending_lock:
+            self._pending.pop(request_id, None)
+
+    def _fail_pending(self, error: str) -> None:
+        """唤醒所有仍在等待的调用方，避免 worker 退出后它们一直等到超时"""
+        with self._pending_lock:
+            boxes = list(self._pending.values())
+        for box in boxes:
+            box.put({"ok": False, "error": error, "is_final": True})
+
+    def _dispatch_responses(
+        self,
+        server_process: multiprocessing.Process,
+        response_queue: MPQueue,
+        stop_event: MPEvent,
+    ) -> None:
+        """后台线程：把 worker 的响应按 request_id 分发到各自的等待队列"""
+        while True:
+            try:
+                message = response_queue.get(timeout=1.0)
+            except Empty:
+                if stop_event.is_set() or not server_process.is_alive():
+                    break
+                continue
+            except (EOFError, OSError, ValueError):
+                break
+
+            request_id = message.get("request_id")
+            with self._pending_lock:
+                response_box = self._pending.get(request_id)
+            if response_box is None:
+                self.logger.warning(f"Discarding unexpected response id: {request_id}")
+                continue
+            response_box.put(message)
+
+        self._fail_pending("gsv_tts worker exited unexpectedly")
 
     def _wait_for_worker_ready(self, timeout: int) -> bool:
         if not self.ready_event:
@@ -525,27 +587,8 @@ class TTSServer:
 
         return True
 
-    def _wait_for_response(self, request_id: str, timeout: int) -> Dict[str, Any]:
-        start_time = time.time()
-        while (time.time() - start_time) < timeout:
-            if self.server_process and not self.server_process.is_alive():
-                raise RuntimeError("gsv_tts worker exited unexpectedly")
-
-            if not self.response_queue:
-                raise RuntimeError("gsv_tts response queue is unavailable")
-
-            if self.server_process and not self.server_process.is_alive():
-                raise RuntimeError("gsv_tts worker exited unexpectedly")
-
-            try:
-                remaining = max(0.1, timeout - (time.time() - start_time))
-                message = self.response_queue.get(timeout=min(1.0, remaining))
-            except Empty:
-                continue
-
-            if message.get("request_id") == request_id:
-                return message
-
-            self.logger.warning(f"Discarding unexpected response id: {message.get('request_id')}")
-
-        raise TimeoutError(f"Timed out waiting for gsv_tts response ({request_id})")
+    def _wait_for_response(self, request_id: str, response_box: queue.Queue, timeout: int) -> Dict[str, Any]:
+        try:
+            return response_box.get(timeout=timeout)
+        except Empty:
+            raise TimeoutError(f"Timed out waiting for gsv_tts response ({request_id})") from None
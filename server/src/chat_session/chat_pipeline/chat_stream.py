@@ -66,6 +66,7 @@ class ChatStream:
             reflection_submitter=self.reflection_worker.submit_completed_turn,
         )
         self.reflection_worker.set_reply_topic_callback(self.topic_replier.add_topic)
+        self.reflection_worker.set_foreground_idle_event(self.topic_replier.idle_event)
         self.ingress_helper.set_msg_consumer(self.topic_planner.feed_unread_message)
         self.topic_planner.set_topic_consumer(self.topic_replier.add_topic)
         self.topic_replier.set_change_state_callback(self.change_state)
@@ -42,6 +42,7 @@ class ReflectionWorker:
         self.logger = get_logger(f"{username}ReflectionWorker")
         self.reflection_queue: asyncio.Queue[CompletedTurn] = asyncio.Queue()
         self.processor_task: asyncio.Task | None = None
+        self.foreground_idle: asyncio.Event | None = None
 
     def set_system_runtime(self, system_runtime: "SystemRuntime") -> None:
         self.system_runtime = system_runtime
@@ -52,6 +53,10 @@ class ReflectionWorker:
     ) -> None:
         self.reply_topic_callback = callback
 
+    def set_foreground_idle_event(self, event: asyncio.Event) -> None:
+        """前台回复空闲事件；未设置时反思不做让步。"""
+        self.foreground_idle = event
+
     def ensure_dependencies(self) -> None:
         """检查反思 worker 依赖已经初始化。"""
         required = {
@@ -87,9 +92,18 @@ class ReflectionWorker:
                     self.reflection_queue.task_done()
 
     async def _reflect_completed_turn(self, turn: CompletedTurn) -> None:
-        await self._process_date_detection(turn)
-        await self._write_topic_memories(turn)
-        await self._compress_context_and_update_profile(turn)
+        # 每个阶段都是 LLM 调用；阶段之间让位给前台回复，已开始的阶段不打断，避免丢失记忆写入
+        for stage in (
+            self._process_date_detection,
+            self._write_topic_memories,
+            self._compress_context_and_update_profile,
+        ):
+            await self._wait_for_foreground_idle()
+            await stage(turn)
+
+    async def _wait_for_foreground_idle(self) -> None:
+        if self.foreground_idle is not None:
+            await self.foreground_idle.wait()
 
     async def _process_date_detection(self, turn: CompletedTurn) -> None:
         if self.system_runtime is None:
@@ -144,13 +158,17 @@ class ReflectionWorker:
         if self.system_runtime is None:
             return
 
+        conversation_service = self.system_runtime.conversation_service
         try:
-            pre_compression_snapshot = await self.system_runtime.conversation_service.get_context_snapshot(
+            # 绝大多数轮次不需要压缩：先只查计数，避免每轮都格式化整份上下文快照
+            if not await conversation_service.context_needs_compression(turn.user_id, character_id=turn.character_id):
+                return
+            pre_compression_snapshot = await conversation_service.get_context_snapshot(
                 turn.user_id,
                 character_id=turn.character_id,
                 ts_type="date",
             )
-            compressed_snapshot = await self.system_runtime.conversation_service.compress_context_if_needed(
+            compressed_snapshot = await conversation_service.compress_context_if_needed(
                 turn.user_id,
                 character_id=turn.character_id,
                 snapshot=pre_compression_snapshot,
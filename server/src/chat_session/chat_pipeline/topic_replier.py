@@ -34,6 +34,9 @@ class TopicReplier:
         self.processor_task: asyncio.Task | None = None
         self.system_runtime: "SystemRuntime" | None = None
         self.is_processing: bool = False
+        # 没有话题在回复/排队时置位；后台反思在其每个阶段开始前等待它，把 LLM 让给前台
+        self.idle_event = asyncio.Event()
+        self.idle_event.set()
         self.change_state_callback : Optional[Callable[[bool, bool], Awaitable[None]]] = None # thinking, speaking
         self.context_provider: Optional[Callable[..., Awaitable[str | dict[str, Any]]]] = context_provider
         self.reflection_submitter = reflection_submitter
@@ -97,9 +100,12 @@ class TopicReplier:
                     return
                 # 新的触摸 Topic，入队并记录指针
                 self._touch_pending = topic
+                self.idle_event.clear()
                 await self.topic_queue.put(topic)
                 self.logger.info("Touch topic enqueued")
         else:
+            # 入队即视为前台忙碌，避免反思任务在 topic 被取走之前抢先开始
+            self.idle_event.clear()
             await self.topic_queue.put(topic)
 
     async def topic_processor(self):
@@ -108,6 +114,7 @@ class TopicReplier:
             try:
                 topic = await self.topic_queue.get()
                 self.is_processing = True
+                self.idle_event.clear()
                 if self._is_touch_topic(topic):
                     async with self._touch_lock:
                         self._touch_processing = True
@@ -127,8 +134,10 @@ class TopicReplier:
                             self._touch_pending = None
                             self._touch_processing = False
                 self.is_processing = False
-                if self.topic_queue.empty() and self.change_state_callback is not None:
-                    await self.change_state_callback(thinking = False) # 进入思考状态
+                if self.topic_queue.empty():
+                    self.idle_event.set()
+                    if self.change_state_callback is not None:
+                        await self.change_state_callback(thinking = False) # 进入思考状态
 
     async def _reply_one_topic(self, topic: "ExtractedTopic") -> None:
         agent = self._agent_for_topic(topic)
@@ -151,29 +160,15 @@ class TopicReplier:
             external_context=None,
         )
 
-        reply_items = await self.system_runtime.agent_runtime.realize_topic_plan(
+        # LLM 每生成完一句就落库并送去合成语音，第一句不必等整段回复生成完
+        reply_items: List[OneResponseLine] = []
+        async for item in self.system_runtime.agent_runtime.realize_topic_plan_stream(
             character_id=character_id,
             user_id=self.user_id,
             plan=attention_plan,
-        )
-        for item in reply_items:
-            if isinstance(item, SongSegmentChat):
-                lyrics = self.system_runtime.capabilities.singing.get_segment_lyrics(
-                    character_id, item.song, item.segment
-                )
-                item.lyrics = lyrics
-
-        uuid_list = await self.system_runtime.conversation_service.persist_agent_replies(
-            user_id=self.user_id,
-            reply_items=reply_items,
-            character_id=character_id,
-        )
-
-        for item, uuid in zip(reply_items, uuid_list or []):
-            if uuid is None:
-                continue
-            item.uuid = uuid
-            await self._submit_speaking_job(self.send_reply_callback, item, character_id)
+        ):
+            reply_items.append(item)
+            await self._dispatch_reply_item(item, character_id)
 
         await self._submit_reflection_turn(
             topic=topic,
@@ -182,6 +177,22 @@ class TopicReplier:
             conversation_history=conversation_history,
         )
 
+    async def _dispatch_reply_item(self, item: OneResponseLine, character_id: str) -> None:
+        if isinstance(item, SongSegmentChat):
+            item.lyrics = self.system_runtime.capabilities.singing.get_segment_lyrics(
+                character_id, item.song, item.segment
+            )
+
+        uuid_list = await self.system_runtime.conversation_service.persist_agent_replies(
+            user_id=self.user_id,
+            reply_items=[item],
+            character_id=character_id,
+        )
+        if not uuid_list or uuid_list[0] is None:
+            return
+        item.uuid = uuid_list[0]
+        await self._submit_speaking_job(self.send_reply_callback, item, character_id)
+
     async def _submit_speaking_job(
         self,
         send_reply_callback: Callable[["ChatResponse"], Awaitable[None]],
@@ -246,6 +246,13 @@ class ConversationService:
             return snapshot.text
         return snapshot.as_prompt_payload()
 
+    async def context_needs_compression(self, user_id: str, character_id: str = "luotianyi") -> bool:
+        '''
+        上下文条数是否超过 raw_conversation_context_limit；只读计数，不构建快照
+        '''
+        context_count = await asyncio.to_thread(self.database.get_context_count, user_id, character_id)
+        return context_count > self.raw_conversation_context_limit
+
     async def compress_context_if_needed(
         self,
         user_id: str,
@@ -319,14 +326,12 @@ class ConversationService:
 
     @staticmethod
     def _format_conversations(conversations: list[dict[str, Any]], *, ts_type: str) -> list[str]:
-        conv_list: list[str] = []
-        for c in conversations:
-            ts = c.get("timestamp", "")
-            if ts_type == "elapsed":
-                ts = timestamp_to_elapsed_time(ts)
-            else:
-                ts = timestamp_to_date(ts)
-            src = c.get("source", "")
-            cnt = c.get("content", "")
-            conv_list.append(f"[{ts}]{src}: {cnt}")
-        return conv_list
+        if ts_type == "elapsed":
+            now = datetime.now()
+            format_ts = lambda ts: timestamp_to_elapsed_time(ts, now)
+        else:
+            format_ts = timestamp_to_date
+        return [
+            f"[{format_ts(c.get('timestamp', ''))}]{c.get('source', '')}: {c.get('content', '')}"
+            for c in conversations
+        ]
@@ -43,6 +43,7 @@ class GlobalSpeakingWorker:
         self.logger = get_logger("GlobalSpeakingWorker")
         self.queue: asyncio.Queue[SpeakingJob] = asyncio.Queue(maxsize=512)
         self.worker_task: asyncio.Task | None = None
+        self._produce_tasks: set[asyncio.Task] = set()
         self.capabilities: "CapabilityManager | None" = None
 
     def start_if_needed(self):
@@ -70,80 +71,124 @@ class GlobalSpeakingWorker:
 
 
     async def _run(self):
-        from src.system.user_interface.types import ChatResponse
-
+        # 两级流水线：_prepare_jobs 提前一句启动 TTS/唱歌音频生成，这里按入队顺序发送，
+        # 上一句还在下发给客户端时，下一句已经在合成了
+        prepared: asyncio.Queue = asyncio.Queue(maxsize=1)
+        preparer = asyncio.create_task(self._prepare_jobs(prepared))
+        try:
+            while True:
+                job, payloads = await prepared.get()
+                try:
+                    await self._deliver(job, payloads)
+                except Exception as e:
+                    self.logger.error(f"Error processing speaking job: {e}")
+                finally:
+                    self.queue.task_done()
+        finally:
+            preparer.cancel()
+            for task in list(self._produce_tasks):
+                task.cancel()
+
+    async def _prepare_jobs(self, prepared: asyncio.Queue):
         while True:
             job = await self.queue.get()
-            try:
-                if isinstance(job.job_content, OneSentenceChat):
-                    display_text = job.job_content.content
-                    sound_text = job.job_content.sound_content
-                    expression = job.job_content.expression
-                    if not sound_text.strip():
-                        resp = ChatResponse(
-                            uuid=job.job_content.uuid,
-                            audio="",
-                            is_final_package=True,
-                            text=display_text,
-                            expression=expression,
-                        )
-                        await job.send_reply_callback(resp)
-                        continue
-
+            payloads: asyncio.Queue = asyncio.Queue()
+            # 先占位再开始生成，保证同时在合成的任务最多比正在发送的多一个
+            await prepared.put((job, payloads))
+            task = asyncio.create_task(self._produce(job, payloads))
+            self._produce_tasks.add(task)
+            task.add_done_callback(self._produce_tasks.discard)
+
+    async def _produce(self, job: SpeakingJob, payloads: asyncio.Queue):
+        """生成任务的音频数据放入 payloads，以 _sentinel 结尾；出错时放入异常交给发送端处理"""
+        try:
+            if isinstance(job.job_content, OneSentenceChat):
+                sound_text = job.job_content.sound_content
+                if sound_text.strip():
                     # Drive the sync TTS generator in a thread so the event loop
                     # can service other tasks between chunks.
                     sync_gen = self.capabilities.speech.say_stream(
                         job.character_id, sound_text, job.job_content.tone
                     )
-                    is_first = True
                     async for audio_chunk in _iter_sync_gen_in_executor(sync_gen):
-                        chunk_text = display_text if is_first else ""
-                        is_first = False
-                        resp = ChatResponse(
-                            uuid=job.job_content.uuid, audio=audio_chunk,
-                            is_final_package=False, text=chunk_text, expression=expression,
-                        )
-                        await job.send_reply_callback(resp)
-                    final_resp = ChatResponse(
-                        uuid=job.job_content.uuid,
-                        audio="", is_final_package=True,
-                        text="", expression="",
-                    )
-                    await job.send_reply_callback(final_resp)
-
-                elif isinstance(job.job_content, SongSegmentChat):
-                    text = f"(唱了《{job.job_content.song}》)\n{job.job_content.lyrics}"
-                    expression = "唱歌"
-                    audio = await asyncio.to_thread(
-                        self.capabilities.singing.sing,
-                        job.character_id,
-                        job.job_content.song,
-                        job.job_content.segment,
-                    )
-                    if not audio:
-                        self.logger.warning(f"No audio generated for song: {job.job_content.song}")
-                        continue
-                    CHUNK_SIZE = 48 * 1024
-                    for i in range(0, len(audio), CHUNK_SIZE):
-                        chunk = audio[i:i+CHUNK_SIZE]
-                        chunk_base64 = base64.b64encode(chunk).decode("utf-8")
-                        chunk_text = "" if i > 0 else text
-                        is_final_package = (i + CHUNK_SIZE) >= len(audio)
-                        chunk_resp = ChatResponse(
-                            uuid=job.job_content.uuid, audio=chunk_base64,
-                            is_final_package=is_final_package, text=chunk_text,
-                            expression=expression,
-                        )
-                        await job.send_reply_callback(chunk_resp)
-                else:
-                    self.logger.warning(f"Unsupported speaking job type: {type(job.job_content)}")
-                    continue
-
-            except Exception as e:
-                self.logger.error(f"Error processing speaking job: {e}")
-                continue
-            finally:
-                self.queue.task_done()
+                        payloads.put_nowait(audio_chunk)
+            elif isinstance(job.job_content, SongSegmentChat):
+                audio = await asyncio.to_thread(
+                    self.capabilities.singing.sing,
+                    job.character_id,
+                    job.job_content.song,
+                    job.job_content.segment,
+                )
+                payloads.put_nowait(audio)
+        except Exception as e:
+            payloads.put_nowait(e)
+        payloads.put_nowait(_sentinel)
+
+    @staticmethod
+    async def _drain(payloads: asyncio.Queue) -> AsyncGenerator[Any, None]:
+        while True:
+            item = await payloads.get()
+            if item is _sentinel:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    async def _deliver(self, job: SpeakingJob, payloads: asyncio.Queue):
+        from src.system.user_interface.types import ChatResponse
+
+        if isinstance(job.job_content, OneSentenceChat):
+            display_text = job.job_content.content
+            expression = job.job_content.expression
+            if not job.job_content.sound_content.strip():
+                resp = ChatResponse(
+                    uuid=job.job_content.uuid,
+                    audio="",
+                    is_final_package=True,
+                    text=display_text,
+                    expression=expression,
+                )
+                await job.send_reply_callback(resp)
+                return
+
+            is_first = True
+            async for audio_chunk in self._drain(payloads):
+                chunk_text = display_text if is_first else ""
+                is_first = False
+                resp = ChatResponse(
+                    uuid=job.job_content.uuid, audio=audio_chunk,
+                    is_final_package=False, text=chunk_text, expression=expression,
+                )
+                await job.send_reply_callback(resp)
+            final_resp = ChatResponse(
+                uuid=job.job_content.uuid,
+                audio="", is_final_package=True,
+                text="", expression="",
+            )
+            await job.send_reply_callback(final_resp)
+
+        elif isinstance(job.job_content, SongSegmentChat):
+            text = f"(唱了《{job.job_content.song}》)\n{job.job_content.lyrics}"
+            expression = "唱歌"
+            results = [audio async for audio in self._drain(payloads)]
+            audio = results[0] if results else None
+            if not audio:
+                self.logger.warning(f"No audio generated for song: {job.job_content.song}")
+                return
+            CHUNK_SIZE = 48 * 1024
+            for i in range(0, len(audio), CHUNK_SIZE):
+                chunk = audio[i:i+CHUNK_SIZE]
+                chunk_base64 = base64.b64encode(chunk).decode("utf-8")
+                chunk_text = "" if i > 0 else text
+                is_final_package = (i + CHUNK_SIZE) >= len(audio)
+                chunk_resp = ChatResponse(
+                    uuid=job.job_content.uuid, audio=chunk_base64,
+                    is_final_package=is_final_package, text=chunk_text,
+                    expression=expression,
+                )
+                await job.send_reply_callback(chunk_resp)
+        else:
+            self.logger.warning(f"Unsupported speaking job type: {type(job.job_content)}")
 
     async def stop(self):
         if self.worker_task:
@@ -53,7 +53,7 @@ class ExtractedTopic:
     source_event_type: str | None = None
     is_forced_from_incomplete: bool = False
 
-@dataclass
+@dataclass(slots=True)
 class ContextInfo:
     summary: str
     conversations: List
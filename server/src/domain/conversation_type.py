@@ -1,13 +1,22 @@
 from datetime import datetime
 from dataclasses import dataclass
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, Optional
 
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
 
-def timestamp_to_elapsed_time(timestamp: str) -> str:
+
+@lru_cache(maxsize=4096)
+def parse_timestamp(timestamp: str) -> datetime:
+    """解析对话时间戳。同一批上下文每轮都会被重新格式化，缓存后 strptime 每条只做一次"""
+    return datetime.strptime(timestamp, TIME_FORMAT)
+
+
+def timestamp_to_elapsed_time(timestamp: str, now: Optional[datetime] = None) -> str:
     try:
-        time_format = "%Y-%m-%d %H:%M:%S"
-        past_time = datetime.strptime(timestamp, time_format)
-        now = datetime.now()
+        past_time = parse_timestamp(timestamp)
+        if now is None:
+            now = datetime.now()
         delta = now - past_time
 
         seconds = int(delta.total_seconds())
@@ -30,10 +39,10 @@ def timestamp_to_elapsed_time(timestamp: str) -> str:
     except:
         return timestamp
     
+@lru_cache(maxsize=4096)
 def timestamp_to_date(timestamp: str) -> str:
     try:
-        time_format = "%Y-%m-%d %H:%M:%S"
-        past_time = datetime.strptime(timestamp, time_format)
+        past_time = parse_timestamp(timestamp)
         return past_time.strftime("%Y-%m-%d")
     except:
         return timestamp
@@ -76,13 +76,15 @@ class SubconsciousMemory:
         if not queries:
             return MemoryContext()
 
+        # 每条线索的检索都包含一次远程 embedding 请求，并发发出，召回耗时取决于最慢的一条而非总和
+        search_queries = list(dict.fromkeys(q for q in ((query or "").strip() for query in queries) if q))
+        search_results = await asyncio.gather(
+            *(self.vector_store.search(user_id, q, k=max(1, k)) for q in search_queries)
+        )
+
         candidate_hits: List[Tuple[float, str, str, Any, str]] = []
         vector_ids: List[str] = []
-        for query in queries:
-            q = (query or "").strip()
-            if not q:
-                continue
-            results = await self.vector_store.search(user_id, q, k=max(1, k))
+        for q, results in zip(search_queries, search_results):
             for doc, score in results:
                 if score < similarity_threshold:
                     continue
@@ -10,7 +10,7 @@ from src.domain.memory_type import Entity, Relation, GraphEntityType, GraphRelat
 import random
 
 from src.utils.logger import get_logger
-from src.system.database.knowledge_graph import KnowledgeGraph
+from src.system.database.knowledge_graph import KnowledgeGraph, coerce_relation_type, relation_type_str
 
 class GraphRetriever(ABC):
     """图检索器基类"""
@@ -150,10 +150,7 @@ class InMemoryGraphRetriever(GraphRetriever):
 
     def _find_entity_by_name(self, graph: KnowledgeGraph, name: str) -> Optional[Entity]:
         """根据名称查找实体"""
-        for entity in graph.entities.values():
-            if entity.name == name:
-                return entity
-        return None
+        return graph.get_entity_by_name(name)
 
     def retrieve_one_entity(self, graph: KnowledgeGraph, entity_name: str) -> Optional[Entity]:
         """检索单个实体"""
@@ -178,7 +175,7 @@ class InMemoryGraphRetriever(GraphRetriever):
                 id=edge_data.get("id", f"{entity_a}_{entity_b}"),
                 source_id=entity_a,
                 target_id=entity_b,
-                relation_type=GraphRelationType(edge_data.get("type")),
+                relation_type=coerce_relation_type(edge_data.get("type")),
                 properties={k: v for k, v in edge_data.items() if k not in ["type", "id"]},
             )
             relations.append(relation)
@@ -190,7 +187,7 @@ class InMemoryGraphRetriever(GraphRetriever):
                 id=edge_data.get("id", f"{entity_b}_{entity_a}"),
                 source_id=entity_b,
                 target_id=entity_a,
-                relation_type=GraphRelationType(edge_data.get("type")),
+                relation_type=coerce_relation_type(edge_data.get("type")),
                 properties={k: v for k, v in edge_data.items() if k not in ["type", "id"]},
             )
             relations.append(relation)
@@ -250,13 +247,13 @@ class InMemoryGraphRetriever(GraphRetriever):
                 # 尝试获取正向边
                 edge_data = graph.graph.get_edge_data(u, v)
                 if edge_data:
-                    r_type = edge_data.get("type", "RELATED_TO")
+                    r_type = relation_type_str(edge_data.get("type", "RELATED_TO"))
                     desc.append(f"{u} --[{r_type}]--> {v}")
                 else:
                     # 尝试获取反向边
                     edge_data = graph.graph.get_edge_data(v, u)
                     if edge_data:
-                        r_type = edge_data.get("type", "RELATED_TO")
+                        r_type = relation_type_str(edge_data.get("type", "RELATED_TO"))
                         desc.append(f"{u} <--[{r_type}]-- {v}")
                     else:
                         desc.append(f"{u} --[UNKNOWN]--> {v}")
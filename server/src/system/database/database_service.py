@@ -7,6 +7,7 @@ from typing import Dict, Any, Optional, List, Tuple, TYPE_CHECKING
 from datetime import datetime
 import uuid
 from src.utils.logger import get_logger
+from src.utils.helpers import json_loads, json_dumps
 
 from src.domain import ConversationItem
 from src.system.database.sql_database import init_sql_db, get_sql_session, SessionLocal
@@ -690,7 +691,7 @@ class DatabaseManager:
                             "source": conv.source,
                             "content": conv.content,
                             "type": conv.type,
-                            "meta_data": json.loads(conv.meta_data) if conv.meta_data else None,
+                            "meta_data": json_loads(conv.meta_data) if conv.meta_data else None,
                         }
                         for conv in reversed(context_conversations)
                     ],
@@ -762,7 +763,7 @@ class DatabaseManager:
                     meta_data_str = None
                     if item.data is not None:
                         try:
-                            meta_data_str = json.dumps(item.data, ensure_ascii=False)
+                            meta_data_str = json_dumps(item.data)
                         except Exception as e:
                             logger.error(f"Failed to serialize meta_data for user {user_id}: {e}")
 
@@ -1001,7 +1002,7 @@ class DatabaseManager:
                     source=conv.source,
                     content=conv.content,
                     type=conv.type,
-                    data=conv.meta_data and json.loads(conv.meta_data) or None,
+                    data=conv.meta_data and json_loads(conv.meta_data) or None,
                     uuid=conv.uuid,
                 ))
             return result
@@ -1021,13 +1022,13 @@ class DatabaseManager:
 
     def get_context_count(self, user_id: str, character_id: str = "luotianyi") -> int:
         """获取用户当前上下文记忆对话数量。"""
-        db = self._new_session()
         redis = self._ensure_redis()
         context_info: Optional[ContextInfo] = self._decode_redis_value(redis.get(self._context_redis_key(user_id, character_id)))
         if context_info and context_info.context_count is not None:
             return context_info.context_count
 
-        # 如果 Redis 中没有缓存，则从数据库中获取 context_memory_count
+        # 如果 Redis 中没有缓存，则从数据库中获取 context_memory_count（只在这时才开 Session）
+        db = self._new_session()
         try:
             user = db.query(User).filter(User.uuid == user_id).first()
             if user:
@@ -1057,7 +1058,7 @@ class DatabaseManager:
 
             if conv and conv.meta_data:
                 try:
-                    meta_data = json.loads(conv.meta_data)
+                    meta_data = json_loads(conv.meta_data)
                     return meta_data.get("image_server_path")
                 except Exception as e:
                     logger.error(f"Failed to parse meta_data for conversation {conv_uuid}: {e}")
@@ -1077,9 +1078,9 @@ class DatabaseManager:
                 ).first()
 
                 if conv and conv.meta_data:
-                    meta_data = json.loads(conv.meta_data)
+                    meta_data = json_loads(conv.meta_data)
                     meta_data["image_client_path"] = new_client_path
-                    conv.meta_data = json.dumps(meta_data, ensure_ascii=False)
+                    conv.meta_data = json_dumps(meta_data)
                     db.commit()
                     return True
                 return False
@@ -3,12 +3,36 @@
 """
 
 from typing import Dict, List, Optional, Any, Tuple, Union
+from collections import defaultdict
+from functools import lru_cache
 import json
 import networkx as nx
 from src.domain.memory_type import Entity, Relation, GraphEntityType, GraphRelationType
+from src.utils.helpers import json_loads
 from src.utils.logger import get_logger
 import os
 
+
+# 类型取值集合很小，缓存 str -> 枚举 的转换，避免每条数据都走一遍 Enum 的构造查找；
+# 无法识别的取值照常抛出 ValueError（异常不会被缓存）
+@lru_cache(maxsize=None)
+def coerce_entity_type(value: Union[str, GraphEntityType]) -> GraphEntityType:
+    return GraphEntityType(value)
+
+
+@lru_cache(maxsize=None)
+def coerce_relation_type(value: Union[str, GraphRelationType]) -> GraphRelationType:
+    return GraphRelationType(value)
+
+
+# 关系类型 -> 字符串。(str, Enum) 成员与其取值的哈希相同，枚举和原始字符串都能直接查表；未知字符串原样返回
+_RELATION_TYPE_STR: Dict[str, str] = {member: member.value for member in GraphRelationType}
+
+
+def relation_type_str(relation_type: Union[str, GraphRelationType]) -> str:
+    return _RELATION_TYPE_STR.get(relation_type, relation_type)
+
+
 class KnowledgeGraph:
     """知识图谱类 (基于 NetworkX 实现)"""
 
@@ -19,6 +43,11 @@ class KnowledgeGraph:
         self.entities: Dict[str, Entity] = {}
         self.relations: Dict[str, Relation] = {}
         self.alias_map: Dict[str, str] = {}
+        # 辅助索引：实体类型 -> {实体ID: 实体}（保持插入顺序）；实体名称 -> 首个同名实体ID
+        self.entities_by_type: Dict[str, Dict[str, Entity]] = defaultdict(dict)
+        self.entity_id_by_name: Dict[str, str] = {}
+        # 自上次加载/保存以来是否有改动，没有改动时 save_graph_data 跳过写盘
+        self._dirty = False
         
         self.config = config
         self.graph_data_dir: Optional[str] = config.get("graph_data_dir", None)
@@ -36,21 +65,44 @@ class KnowledgeGraph:
 
     def add_entity(self, entity: Entity) -> None:
         """添加实体"""
+        if self._register_entity(entity):
+            self.graph.add_node(entity.id, **entity.properties, type=entity.entity_type, name=entity.name)
+            self._dirty = True
+
+    def _register_entity(self, entity: Entity) -> bool:
+        """登记实体及其索引（不写入 NetworkX 图），实体已存在时返回 False"""
         if entity.id in self.entities:
             # print(f"实体已存在: {entity.id}")
-            return
+            return False
         self.entities[entity.id] = entity
-        self.graph.add_node(entity.id, **entity.properties, type=entity.entity_type, name=entity.name)
+        self.entities_by_type[entity.entity_type.value][entity.id] = entity
+        self.entity_id_by_name.setdefault(entity.name, entity.id)
+        return True
 
     def update_entity(self, entity: Entity) -> None:
         """更新实体"""
         if entity.id not in self.entities:
             print(f"实体不存在: {entity.id}")
             return
+        old_entity = self.entities[entity.id]
+        node = self.graph.nodes[entity.id]
+        # 内容没有变化（包括调用方原地修改后再传回同一对象的情况，用图节点上的属性判断）时直接跳过
+        if old_entity == entity and all(k in node and node[k] == v for k, v in self._node_attrs(entity).items()):
+            return
+        # 旧的类型和名称取自图节点：调用方原地修改后传回同一对象时，old_entity 已经是新值
+        old_type = getattr(node.get("type"), "value", node.get("type"))
+        old_name = node.get("name")
+        if old_type != entity.entity_type.value:
+            self.entities_by_type[old_type].pop(entity.id, None)
         self.entities[entity.id] = entity
-        self.graph.nodes[entity.id].update(entity.properties)
-        self.graph.nodes[entity.id]["type"] = entity.entity_type
-        self.graph.nodes[entity.id]["name"] = entity.name
+        self.entities_by_type[entity.entity_type.value][entity.id] = entity
+        if old_name != entity.name:
+            self._reindex_name(old_name)
+            self._reindex_name(entity.name)
+        node.update(entity.properties)
+        node["type"] = entity.entity_type
+        node["name"] = entity.name
+        self._dirty = True
 
     def add_relation(self, relation: Relation) -> None:
         """添加关系"""
@@ -61,6 +113,15 @@ class KnowledgeGraph:
         self.graph.add_edge(
             relation.source_id, relation.target_id, id=relation.id, type=relation.relation_type, **relation.properties
         )
+        self._dirty = True
+
+    @staticmethod
+    def _node_attrs(entity: Entity) -> Dict[str, Any]:
+        return dict(entity.properties, type=entity.entity_type, name=entity.name)
+
+    @staticmethod
+    def _edge_attrs(relation: Relation) -> Dict[str, Any]:
+        return dict(id=relation.id, type=relation.relation_type, **relation.properties)
 
     def has_entity(self, entity_id: str) -> bool:
         """检查实体是否存在"""
@@ -83,8 +144,8 @@ class KnowledgeGraph:
         Returns:
             (邻居实体, 关系类型) 的列表
         """
-        if relation_type and hasattr(relation_type, "value"):
-            relation_type = relation_type.value
+        if relation_type:
+            relation_type = relation_type_str(relation_type)
         if neighbor_type and hasattr(neighbor_type, "value"):
             neighbor_type = neighbor_type.value
 
@@ -92,16 +153,16 @@ class KnowledgeGraph:
             return []
 
         results = []
+        nodes = self.graph.nodes
+        # 用 out_edges / in_edges(data=True) 一次拿到邻居和边属性，省去逐条 get_edge_data
         # print(f"获取实体 '{entity_id}' 的邻居，方向: {direction}, 关系类型: {relation_type}, 邻居类型: {neighbor_type}")
         # Outgoing
         if direction in ["outgoing", "both"]:
-            for neighbor_id in self.graph.successors(entity_id):
-                neighbor_data = self.graph.nodes[neighbor_id]
-                n_type = neighbor_data.get("type").value
+            for _, neighbor_id, edge_data in self.graph.out_edges(entity_id, data=True):
+                n_type = nodes[neighbor_id].get("type").value
                 if neighbor_type and n_type != neighbor_type:
                     continue
-                edge_data = self.graph.get_edge_data(entity_id, neighbor_id)
-                r_type = edge_data.get("type").value
+                r_type = relation_type_str(edge_data.get("type"))
                 if relation_type and r_type != relation_type:
                     continue
                 if neighbor_id in self.entities:
@@ -109,14 +170,11 @@ class KnowledgeGraph:
 
         # Incoming
         if direction in ["incoming", "both"]:
-            for neighbor_id in self.graph.predecessors(entity_id):
-                neighbor_data = self.graph.nodes[neighbor_id]
-                # print(neighbor_data)
-                n_type = neighbor_data.get("type").value
+            for neighbor_id, _, edge_data in self.graph.in_edges(entity_id, data=True):
+                n_type = nodes[neighbor_id].get("type").value
                 if neighbor_type and n_type != neighbor_type:
                     continue
-                edge_data = self.graph.get_edge_data(neighbor_id, entity_id)
-                r_type = edge_data.get("type").value
+                r_type = relation_type_str(edge_data.get("type"))
                 if relation_type and r_type != relation_type:
                     continue
                 if neighbor_id in self.entities:
@@ -151,12 +209,20 @@ class KnowledgeGraph:
         if hasattr(entity_type, "value"):
             entity_type = entity_type.value
 
-        results = []
+        return list(self.entities_by_type.get(entity_type, {}).values())
+
+    def get_entity_by_name(self, name: str) -> Optional[Entity]:
+        """按名称查找实体（同名时返回最先加入的那个）"""
+        entity_id = self.entity_id_by_name.get(name)
+        return self.entities.get(entity_id) if entity_id is not None else None
+
+    def _reindex_name(self, name: str) -> None:
+        """实体改名后重新确定该名称对应的首个实体"""
+        self.entity_id_by_name.pop(name, None)
         for entity in self.entities.values():
-            e_type = entity.entity_type.value
-            if e_type == entity_type:
-                results.append(entity)
-        return results
+            if entity.name == name:
+                self.entity_id_by_name[name] = entity.id
+                break
 
     def load_graph_data(self, data_path: str, alias_path: str) -> None:
         """加载图数据
@@ -170,30 +236,45 @@ class KnowledgeGraph:
             os.makedirs(self.graph_data_dir, exist_ok=True)
             
         try:
-            with open(data_path, "r", encoding="utf-8") as f:
-                data: Dict[str, Any] = json.load(f)
-
-            # 加载实体
+            # 图数据文件是启动时最大的 JSON，按字节读入后交给 json_loads（装了 orjson 时更快）
+            with open(data_path, "rb") as f:
+                data: Dict[str, Any] = json_loads(f.read())
+
+            # 加载实体：先登记索引，最后一次性 add_nodes_from 写入图
+            register_entity = self._register_entity
+            node_attrs = self._node_attrs
+            new_nodes = []
             for entity_data in data.get("entities", []):
                 entity = Entity(
                     id=entity_data["id"],
                     name=entity_data["name"],
-                    entity_type=GraphEntityType(entity_data["type"]),
+                    entity_type=coerce_entity_type(entity_data["type"]),
                     properties=entity_data.get("properties", {}),
                 )
-                self.add_entity(entity)
-
-            # 加载关系
+                if register_entity(entity):
+                    new_nodes.append((entity.id, node_attrs(entity)))
+            self.graph.add_nodes_from(new_nodes)
+
+            # 加载关系：同样批量 add_edges_from
+            relations = self.relations
+            edge_attrs = self._edge_attrs
+            new_edges = []
             for relation_data in data.get("relations", []):
+                relation_id = relation_data["id"]
+                if relation_id in relations:
+                    continue
                 relation = Relation(
-                    id=relation_data["id"],
+                    id=relation_id,
                     source_id=relation_data["source"],
                     target_id=relation_data["target"],
-                    relation_type=GraphRelationType(relation_data["type"]),
+                    relation_type=coerce_relation_type(relation_data["type"]),
                     properties=relation_data.get("properties", {}),
                     weight=relation_data.get("weight", 1.0),
                 )
-                self.add_relation(relation)
+                relations[relation_id] = relation
+                new_edges.append((relation.source_id, relation.target_id, edge_attrs(relation)))
+            self.graph.add_edges_from(new_edges)
+            self._dirty = False
 
             self.logger.info(f"加载了 {len(self.entities)} 个实体和 {len(self.relations)} 个关系")
 
@@ -201,19 +282,26 @@ class KnowledgeGraph:
             self.logger.error(f"加载图数据失败: {e}")
 
         try:
-            with open(alias_path, "r", encoding="utf-8") as f:
-                self.alias_map = json.load(f)
+            with open(alias_path, "rb") as f:
+                self.alias_map = json_loads(f.read())
             self.logger.info(f"加载了 {len(self.alias_map)} 条别名映射")
         except Exception as e:
             self.logger.error(f"加载别名映射失败: {e}")
             self.alias_map = {}
 
-    def save_graph_data(self) -> None:
-        """保存图数据"""
+    def save_graph_data(self, force: bool = False) -> None:
+        """保存图数据
+
+        Args:
+            force: 即使自上次加载/保存以来没有改动也写盘
+        """
         data_path = self.graph_data_path
         if not data_path:
              self.logger.error("未指定数据路径，无法保存")
              return
+        if not self._dirty and not force:
+            self.logger.info("图数据没有改动，跳过保存")
+            return
              
         try:
             data = {
@@ -235,6 +323,7 @@ class KnowledgeGraph:
             }
             with open(data_path, "w", encoding="utf-8") as f:
                 json.dump(data, f, ensure_ascii=False, indent=4)
+            self._dirty = False
             self.logger.info(f"图数据已保存到 {data_path}")
         except Exception as e:
             self.logger.error(f"保存图数据失败: {e}")
@@ -14,7 +14,7 @@ class WatchError(Exception):
     """Compatibility error type for Redis-like optimistic locking APIs."""
 
 
-@dataclass
+@dataclass(slots=True)
 class _Entry:
     value: Any # The stored value, can be of any type for better flexibility.
     expire_at: Optional[float]
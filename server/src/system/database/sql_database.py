@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, String, Integer, DateTime, Boolean, ForeignKey, Text, Engine, event, text, UniqueConstraint, Float
+from sqlalchemy import create_engine, Column, String, Integer, DateTime, Boolean, ForeignKey, Text, Engine, event, text, UniqueConstraint, Float, Index
 from sqlalchemy.orm import sessionmaker, declarative_base, relationship
 from datetime import datetime
 import uuid
@@ -61,6 +61,11 @@ class Conversation(Base):
     
     user = relationship("User", back_populates="conversations")
 
+    # 历史记录分页、上下文预填都是 “按用户过滤 + 按时间排序”，复合索引让 OFFSET/LIMIT 走索引而不是全表排序
+    __table_args__ = (
+        Index("ix_conversations_user_timestamp", "user_id", "timestamp"),
+    )
+
 
 class ConversationContext(Base):
     __tablename__ = "conversation_contexts"
@@ -325,6 +330,9 @@ def _migrate_sqlite_schema(db_engine: Engine) -> None:
         connection.exec_driver_sql(
             "CREATE INDEX IF NOT EXISTS ix_conversations_character_id ON conversations (character_id)"
         )
+        connection.exec_driver_sql(
+            "CREATE INDEX IF NOT EXISTS ix_conversations_user_timestamp ON conversations (user_id, timestamp)"
+        )
 
         event_columns = {
             row[1]
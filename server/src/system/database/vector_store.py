@@ -87,8 +87,22 @@ from chromadb.config import Settings
 from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
 
 import asyncio
+import functools
 from concurrent.futures import ThreadPoolExecutor
 
+
+@functools.lru_cache(maxsize=4)
+def _get_embedder(model: str, api_key: str, base_url: str, batch_size: int, cache_path: Optional[str]) -> SiliconFlowEmbeddings:
+    """相同配置的向量库共用一个 Embedding 实例（连接池、线程池和缓存连接都只建一份）"""
+    return SiliconFlowEmbeddings(
+        model=model,
+        base_url=base_url,
+        api_key=api_key,
+        batch_size=batch_size,
+        cache_path=cache_path,
+    )
+
+
 class ChromaVectorStore(VectorStore):
     """Chroma向量数据库实现 (Native Client)"""
     
@@ -125,10 +139,13 @@ class ChromaVectorStore(VectorStore):
         """初始化Chroma客户端和集合"""
         try:
             # 初始化 Embedding 模型
-            embedding_function = SiliconFlowEmbeddings(
-                model=self.embedding_model_name,
-                base_url="https://api.siliconflow.cn/v1",
-                api_key=self.api_key
+            embedding_function = _get_embedder(
+                self.embedding_model_name,
+                self.api_key,
+                "https://api.siliconflow.cn/v1",
+                self.embedding_model_config.get("batch_size", 32),
+                # 向量缓存默认关闭：运行时每条检索 query 都会被写入且不会淘汰，只在重建知识库时按需开启
+                self.embedding_model_config.get("cache_path") or None,
             )
             
             # 创建客户端
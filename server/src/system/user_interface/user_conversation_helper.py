@@ -6,6 +6,8 @@ from src.utils.enum_type import ContextType
 if TYPE_CHECKING:
     from src.system.database import DatabaseManager
 
+_IMAGE_TYPE = ContextType.IMAGE.value
+
 
 class UserConversationHelper:
     """
@@ -30,18 +32,20 @@ class UserConversationHelper:
             start_index,
             end_index,
         )
-        ret: dict[str, Any] = {"history": [], "start_index": start_index}
-        for item in history_items:
-            content = item.content
-            if item.type == ContextType.IMAGE.value and item.data:
-                content = item.data.get("image_client_path")
-            ret["history"].append(
-                {
-                    "uuid": item.uuid,
-                    "content": content,
-                    "source": item.source,
-                    "timestamp": item.timestamp,
-                    "type": item.type,
-                }
-            )
-        return ret
+        return {
+            "history": [self._history_entry(item) for item in history_items],
+            "start_index": start_index,
+        }
+
+    @staticmethod
+    def _history_entry(item: ConversationItem) -> dict[str, Any]:
+        content = item.content
+        if item.type == _IMAGE_TYPE and item.data:
+            content = item.data.get("image_client_path")
+        return {
+            "uuid": item.uuid,
+            "content": content,
+            "source": item.source,
+            "timestamp": item.timestamp,
+            "type": item.type,
+        }
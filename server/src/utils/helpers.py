@@ -15,6 +15,11 @@ from typing import Any, Dict, List, Optional, Union
 from pathlib import Path
 import re
 
+try:
+    import orjson  # 可选依赖：更快的 JSON 编解码
+except ImportError:
+    orjson = None
+
 
 def load_config(config_path: str, default_config: Optional[Dict] = None) -> Dict[str, Any]:
     """加载配置文件
@@ -51,6 +56,32 @@ def load_config(config_path: str, default_config: Optional[Dict] = None) -> Dict
     
     return config
 
+def json_loads(data: Union[str, bytes]) -> Any:
+    """解析 JSON 文本/字节，安装了 orjson 时使用 orjson"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps_bytes(obj: Any, indent: bool = False, default: Any = None) -> bytes:
+    """将对象序列化为 UTF-8 编码的 JSON 字节（不转义非 ASCII 字符），安装了 orjson 时使用 orjson
+
+    Args:
+        obj: 待序列化对象
+        indent: 是否以 2 空格缩进输出
+        default: 无法序列化对象的回调，同 json.dumps 的 default
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, default=default, option=option)
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None, default=default).encode("utf-8")
+
+
+def json_dumps(obj: Any, indent: bool = False, default: Any = None) -> str:
+    """同 json_dumps_bytes，但返回 str，用于写入数据库文本列等场景"""
+    return json_dumps_bytes(obj, indent=indent, default=default).decode("utf-8")
+
+
 def get_unified_song_name(song_name: str) -> str:
     '''
         去除所有的空格，标点符号（？！?1~，,、·），书名号
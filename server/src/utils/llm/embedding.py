@@ -1,43 +1,167 @@
 
+import hashlib
+import random
+import sqlite3
+import threading
+import time
+import numpy as np
 import requests
-from typing import List, Union
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Dict, List, Optional, Union
 from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
 
+# 限流和服务端临时错误，按退避重试
+_RETRY_STATUS = {429, 500, 502, 503, 504}
+
 
 class SiliconFlowEmbeddings(EmbeddingFunction):
-    def __init__(self, model="BAAI/bge-m3", api_key=None, base_url="https://api.siliconflow.cn/v1"):
+    def __init__(
+        self,
+        model="BAAI/bge-m3",
+        api_key=None,
+        base_url="https://api.siliconflow.cn/v1",
+        batch_size: int = 32,
+        max_retries: int = 3,
+        timeout: float = 30.0,
+        max_concurrency: int = 5,
+        cache_path: Optional[str] = None,
+    ):
         self.model = model
         self.api_key = api_key
         if not self.api_key:
             raise ValueError("API key for SiliconFlowEmbeddings cannot be None.")
         self.base_url = base_url
+        self.batch_size = max(1, int(batch_size))
+        self.max_retries = max(0, int(max_retries))
+        self.timeout = timeout
+        self.max_concurrency = max(1, int(max_concurrency))
+        self._executor: ThreadPoolExecutor | None = None
+
+        # 复用 TCP/TLS 连接，避免每个批次重新握手；连接池至少容纳所有并发批次
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(8, self.max_concurrency))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
-    def __call__(self, input: Documents) -> Embeddings: # not used?
+        # 按 (model, text) 的 SHA-256 持久化缓存向量，重建知识库时相同文本不再请求接口
+        self._cache: Optional[sqlite3.Connection] = None
+        self._cache_lock = threading.Lock()
+        if cache_path:
+            self._cache = sqlite3.connect(cache_path, check_same_thread=False)
+            self._cache.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+            self._cache.commit()
+
+    def __call__(self, input: Documents) -> Embeddings:
         return self.embed_documents(input)
 
-    def embed_documents(self, texts): # not used?
-        return [self._embed(text) for text in texts]
+    def embed_documents(self, texts: List[str]) -> Embeddings:
+        """先查缓存，未命中的文本再批量请求接口，结果与输入顺序一致"""
+        texts = list(texts)
+        if self._cache is None:
+            return self._embed_uncached(texts)
+
+        keys = [self._cache_key(text) for text in texts]
+        cached = self._cache_get(set(keys))
+        # 同一文本在一次调用中出现多次时只请求一次
+        missing = list(dict.fromkeys(key for key in keys if key not in cached))
+        if missing:
+            text_by_key = dict(zip(keys, texts))
+            fresh = dict(zip(missing, self._embed_uncached([text_by_key[key] for key in missing])))
+            self._cache_put(fresh)
+            cached.update(fresh)
+        return [cached[key] for key in keys]
 
-    def embed_query(self, *args, **kwargs): 
+    def _embed_uncached(self, texts: List[str]) -> Embeddings:
+        """按 batch_size 打包请求，多个批次并发发出，结果与输入顺序一致"""
+        batches = [texts[start:start + self.batch_size] for start in range(0, len(texts), self.batch_size)]
+        if len(batches) <= 1 or self.max_concurrency == 1:
+            results = [self._embed_batch(batch) for batch in batches]
+        else:
+            # executor.map 按提交顺序返回结果
+            results = list(self._get_executor().map(self._embed_batch, batches))
+        embeddings: Embeddings = []
+        for batch_embeddings in results:
+            embeddings.extend(batch_embeddings)
+        return embeddings
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="embedding")
+        return self._executor
+
+    def embed_query(self, *args, **kwargs):
         input_val = kwargs.get('input')
         if input_val is None and args:
             input_val = args[0]
-            
+
         if isinstance(input_val, list):
-             return [self._embed(single_input) for single_input in input_val]
+            return self.embed_documents(input_val)
         return self._embed(input_val)
 
     def _embed(self, text):
+        return self.embed_documents([text])[0]
+
+    def _cache_key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model}|{text}".encode("utf-8")).hexdigest()
+
+    def _cache_get(self, keys) -> Dict[str, np.ndarray]:
+        keys = list(keys)
+        result: Dict[str, np.ndarray] = {}
+        with self._cache_lock:
+            # 分段查询，避免超过 SQLite 的参数个数上限
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = self._cache.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                for key, blob in rows:
+                    result[key] = np.frombuffer(blob, dtype=np.float32)
+        return result
+
+    def _cache_put(self, vectors: Dict[str, np.ndarray]) -> None:
+        rows = [(key, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in vectors.items()]
+        with self._cache_lock:
+            self._cache.executemany("INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows)
+            self._cache.commit()
+
+    def _embed_batch(self, texts: List[str]) -> Embeddings:
         url = f"{self.base_url}/embeddings"
         headers = {"Authorization": f"Bearer {self.api_key}"}
-        payload = {"model": self.model, "input": text}
-        resp = requests.post(url, headers=headers, json=payload)
-        resp.raise_for_status()
-        return resp.json()["data"][0]["embedding"]
-    
+        payload = {"model": self.model, "input": texts}
+        for attempt in range(self.max_retries + 1):
+            try:
+                resp = self.session.post(url, headers=headers, json=payload, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+                time.sleep(self._retry_delay(None, attempt))
+                continue
+            if resp.status_code in _RETRY_STATUS and attempt < self.max_retries:
+                time.sleep(self._retry_delay(resp, attempt))
+                continue
+            resp.raise_for_status()
+            data = resp.json()["data"]
+            # OpenAI 兼容接口按 index 标注顺序，排序后与输入一一对应；
+            # 一次性转成 float32 矩阵，Chroma 内部本就按 float32 数组处理
+            ordered = sorted(data, key=lambda item: item.get("index", 0))
+            return list(np.asarray([item["embedding"] for item in ordered], dtype=np.float32))
+        raise RuntimeError("unreachable")
+
+    @staticmethod
+    def _retry_delay(resp: Union[requests.Response, None], attempt: int) -> float:
+        retry_after = resp.headers.get("Retry-After") if resp is not None else None
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after)) + random.uniform(0, 0.05)
+            except ValueError:
+                pass
+        # 加一点抖动，避免并发批次同时被限流后又同时重试
+        return 0.5 * (2 ** attempt) + random.uniform(0, 0.05)
+
     @staticmethod
     def name() -> str:
         return "SiliconFlowEmbeddings"
-    
+
     # def is_legacy(self) -> bool:
-    #     return False
\ No newline at end of file
+    #     return False
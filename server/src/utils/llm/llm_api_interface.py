@@ -4,9 +4,10 @@ src.llm.llm_api_interface.py
 实现各种LLM API接口的统一调用接口
 """
 
-from typing import Dict, List, Optional, Any, Tuple
+from typing import AsyncGenerator, Dict, List, Optional, Any, Tuple, Type
 from abc import ABC, abstractmethod
 from src.utils.logger import get_logger
+from src.utils.helpers import json_dumps_bytes, json_loads
 from src.domain.tool_type import MyTool
 from typing import List, Dict, Any
 import json
@@ -29,6 +30,52 @@ class LLMAPIInterface(ABC):
         """
         pass
 
+    async def generate_response_stream(self, prompt: str, params: Dict[str, Any], enable_thinking: bool = False, use_json: bool = False, **kwargs) -> AsyncGenerator[str, None]:
+        """
+        流式生成LLM的响应 (异步)，逐段产出文本增量
+
+        不支持流式的接口沿用这个默认实现：等完整回复生成后一次性产出。
+
+        :param prompt: 用户输入的提示语
+        :param params: 生成响应所需的参数
+        :param enable_thinking: 是否启用思考过程
+        :param use_json: 是否使用JSON格式输出
+        :return: 文本增量的异步生成器
+        """
+        response = await self.generate_response(prompt, params=params, enable_thinking=enable_thinking, use_json=use_json, **kwargs)
+        content = response.get("content", "") if isinstance(response, dict) else response
+        if content:
+            yield content
+
+    async def generate_batch(
+        self,
+        prompts: List[str],
+        params: Dict[str, Any],
+        enable_thinking: bool = False,
+        use_json: bool = False,
+        max_concurrency: int = 10,
+        **kwargs,
+    ) -> List[Dict[str, Any] | BaseException]:
+        """
+        并发生成多个 prompt 的响应，最多同时发出 max_concurrency 个请求
+
+        每个请求各自按 generate_response 的逻辑重试；某个 prompt 最终失败时，
+        结果列表对应位置是该异常，不影响其他 prompt。
+
+        :param prompts: prompt 列表
+        :param max_concurrency: 最大并发请求数
+        :return: 与 prompts 顺序一致的响应字典（或异常）列表
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def _one(prompt: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.generate_response(
+                    prompt, params=params, enable_thinking=enable_thinking, use_json=use_json, **kwargs
+                )
+
+        return await asyncio.gather(*(_one(prompt) for prompt in prompts), return_exceptions=True)
+
     @abstractmethod
     def set_parameters(self, **params) -> None:
         """
@@ -48,16 +95,154 @@ class LLMAPIInterface(ABC):
         pass
 
 
+# api_type -> 接口类；新增后端只需用 @register_api_type 装饰，无需修改 LLMAPIFactory
+_API_REGISTRY: Dict[str, Type[LLMAPIInterface]] = {}
+
+
+def register_api_type(name: str):
+    """把接口类注册为配置中 api_type=name 对应的实现"""
+    def decorator(cls: Type[LLMAPIInterface]) -> Type[LLMAPIInterface]:
+        _API_REGISTRY[name.lower()] = cls
+        return cls
+    return decorator
+
+
 """
 硅基流动API接口实现
 """
-from openai import OpenAI
-from collections import deque
+from collections import OrderedDict
+import hashlib
 import time
 import random
 from threading import Lock
 
 
+class ExactResponseCache:
+    """精确匹配的响应 LRU 缓存，键为 (模型, prompt, 采样参数, 请求参数) 的哈希。
+    只应缓存确定性请求 (temperature == 0)，否则相同 prompt 本应得到不同回复。"""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._items: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        self._lock = Lock()
+
+    @staticmethod
+    def make_key(*parts: Any) -> bytes:
+        raw = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).digest()
+
+    def get(self, key: bytes) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            self._items.move_to_end(key)
+        # 命中时没有发生请求，不计 token 和用时
+        return {
+            **item,
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            "response_time_s": 0.0,
+        }
+
+    def put(self, key: bytes, response: Dict[str, Any]) -> None:
+        with self._lock:
+            self._items[key] = response
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+
+def _create_response_cache(config: Dict[str, Any]) -> Tuple[Optional[ExactResponseCache], bool]:
+    """按配置创建精确匹配缓存；response_cache_size 为 0 时关闭"""
+    size = int(config.get("response_cache_size", 1024))
+    cache = ExactResponseCache(size) if size > 0 else None
+    return cache, bool(config.get("cache_nondeterministic", False))
+
+
+class TokenBucket:
+    """请求前的令牌桶限流：容量 capacity，每秒补充 refill_per_sec 个令牌。
+    令牌不足时按缺口预约等待时间，并发调用按到达顺序依次放行。"""
+
+    def __init__(self, capacity: float, refill_per_sec: float):
+        self.capacity = float(capacity)
+        self.refill_per_sec = float(refill_per_sec)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = Lock()
+
+    def _reserve(self, n: float) -> float:
+        """扣除 n 个令牌（允许为负，表示已被预约），返回需要等待的秒数"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_per_sec)
+            self._updated = now
+            self._tokens -= n
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.refill_per_sec
+
+    async def acquire(self, n: float = 1) -> None:
+        wait = self._reserve(n)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+# 同一 (endpoint, api_key) 的所有接口实例共用一个令牌桶，服务商按密钥计算 RPM
+_token_buckets: Dict[Tuple[str, str], TokenBucket] = {}
+_token_buckets_lock = Lock()
+
+
+def _get_token_bucket(config: Dict[str, Any], endpoint: str, api_key: str) -> Optional[TokenBucket]:
+    """配置了 requests_per_minute 时返回共享令牌桶，否则不限流"""
+    rpm = config.get("requests_per_minute")
+    if not rpm:
+        return None
+    with _token_buckets_lock:
+        bucket = _token_buckets.get((endpoint, api_key))
+        if bucket is None:
+            bucket = TokenBucket(config.get("rate_limit_burst", rpm), rpm / 60.0)
+            _token_buckets[(endpoint, api_key)] = bucket
+        return bucket
+
+
+class ExponentialBackoff:
+    """指数退避：min(max_delay, base * factor**attempt)，再乘以 ±jitter_pct 的随机抖动。
+    异常里带有 Retry-After（如 429）时以服务端给出的等待时间为准。"""
+
+    def __init__(self, base: float = 0.5, max_delay: float = 30.0, factor: float = 2.0, jitter_pct: float = 0.25):
+        self.base = base
+        self.max_delay = max_delay
+        self.factor = factor
+        self.jitter_pct = jitter_pct
+
+    def delay(self, attempt: int, exc: Optional[BaseException] = None) -> float:
+        retry_after = self._retry_after(exc)
+        if retry_after is not None:
+            return retry_after
+        delay = min(self.max_delay, self.base * (self.factor ** attempt))
+        return delay * (1 + random.uniform(-self.jitter_pct, self.jitter_pct))
+
+    @staticmethod
+    def _retry_after(exc: Optional[BaseException]) -> Optional[float]:
+        # openai.APIStatusError 和 requests.HTTPError 都把原始响应挂在 exc.response 上
+        headers = getattr(getattr(exc, "response", None), "headers", None)
+        if not headers:
+            return None
+        try:
+            value = headers.get("Retry-After")
+            return max(0.0, float(value)) if value is not None else None
+        except (TypeError, ValueError):
+            return None
+
+
+def _create_backoff(config: Dict[str, Any]) -> ExponentialBackoff:
+    return ExponentialBackoff(
+        base=config.get("retry_delay", 0.5),
+        max_delay=config.get("max_backoff", 30.0),
+    )
+
+
+@register_api_type("openai")
 class OpenAIAPIInterface(LLMAPIInterface):  
     '''
     实现了LLMAPIInterface接口，使用OpenAI Python SDK调用硅基流动API
@@ -78,6 +263,9 @@ class OpenAIAPIInterface(LLMAPIInterface):
             self._ssl_cert_file_removed = True
 
         try:
+            # openai SDK 导入较重（pydantic、httpx 等），只在真正创建该接口时才导入
+            from openai import OpenAI
+
             # 兼容同步和异步调用
             self.client = OpenAI(base_url=self.base_url, api_key=self.api_key)
             self.logger.info(f"OpenAI客户端初始化完成，模型: {self.model}")
@@ -93,25 +281,29 @@ class OpenAIAPIInterface(LLMAPIInterface):
         使用 asyncio.to_thread 包装阻塞的同步调用
         """
         last_exception = None
-        kwargs = kwargs or {}
         params = params or {}
-        if self.can_enable_thinking:
-            kwargs["extra_body"] = {"enable_thinking": enable_thinking}
-        if use_json and self.can_use_json:
-            kwargs["response_format"] = {"type": "json_object"}
+        kwargs = self._build_request_kwargs(enable_thinking, use_json, kwargs)
+        sampling_params = self._sampling_params(params)
+
+        cache_key = None
+        if self.response_cache is not None and (sampling_params["temperature"] == 0 or self.cache_nondeterministic):
+            cache_key = ExactResponseCache.make_key(self.model, prompt, sampling_params, kwargs)
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
 
         for attempt in range(self.max_retries):
             try:
+                if self.token_bucket is not None:
+                    await self.token_bucket.acquire()
                 st_time = time.time()
-                
+
                 # 定义一个同步函数来执行实际的阻塞调用
                 def _do_request(messages: List, use_json: bool):
                     return self.client.chat.completions.create(
                         messages=messages,
                         model=self.model,
-                        max_tokens=params.get("max_tokens", self.default_parameters.get("max_tokens", 8192)),
-                        temperature=params.get("temperature", self.default_parameters.get("temperature", 0.7)),
-                        top_p=params.get("top_p", self.default_parameters.get("top_p", 0.9)),
+                        **sampling_params,
                         **kwargs,
                     )
                 
@@ -120,6 +312,8 @@ class OpenAIAPIInterface(LLMAPIInterface):
                 
                 elapsed = time.time() - st_time
                 extracted = self._extract_content(ret, elapsed=elapsed)
+                if cache_key is not None and extracted["content"]:
+                    self.response_cache.put(cache_key, extracted)
                 return extracted
 
             except Exception as e:
@@ -128,12 +322,90 @@ class OpenAIAPIInterface(LLMAPIInterface):
 
                 if attempt < self.max_retries - 1:
                     # 异步等待
-                    delay = self.retry_delay * (2**attempt) + random.uniform(0, 1)
-                    await asyncio.sleep(delay)
+                    await asyncio.sleep(self.backoff.delay(attempt, e))
 
         # 所有重试都失败
         self.logger.error(f"Generate response failed after {self.max_retries} retries.")
         raise last_exception if last_exception else Exception("Unknown error")
+
+    async def generate_response_stream(self, prompt: str, params: Dict[str, Any], enable_thinking: bool = False, use_json: bool = False, **kwargs) -> AsyncGenerator[str, None]:
+        """
+        以 stream=True 调用，边生成边产出文本增量。
+        只在尚未产出任何内容时重试，避免调用方收到重复的开头。
+        """
+        last_exception = None
+        params = params or {}
+        kwargs = self._build_request_kwargs(enable_thinking, use_json, kwargs)
+
+        def _open_stream():
+            return self.client.chat.completions.create(
+                messages=[{"role": "system", "content": prompt}],
+                model=self.model,
+                stream=True,
+                **self._sampling_params(params),
+                **kwargs,
+            )
+
+        for attempt in range(self.max_retries):
+            yielded = False
+            stream = None
+            try:
+                if self.token_bucket is not None:
+                    await self.token_bucket.acquire()
+                st_time = time.time()
+                stream = await asyncio.to_thread(_open_stream)
+                chunks = iter(stream)
+                while True:
+                    # 每取一个分片都是阻塞的网络读，放到线程里执行
+                    chunk = await asyncio.to_thread(next, chunks, None)
+                    if chunk is None:
+                        break
+                    delta = self._extract_delta(chunk)
+                    if delta:
+                        yielded = True
+                        yield delta
+                self.logger.debug(f"Stream response finished in {time.time() - st_time:.2f}s")
+                return
+
+            except Exception as e:
+                if yielded:
+                    raise
+                last_exception = e
+                self.logger.warning(f"流式请求失败 (尝试 {attempt + 1}/{self.max_retries}): {e}")
+
+                if attempt < self.max_retries - 1:
+                    await asyncio.sleep(self.backoff.delay(attempt, e))
+            finally:
+                if stream is not None and hasattr(stream, "close"):
+                    stream.close()
+
+        self.logger.error(f"Generate response stream failed after {self.max_retries} retries.")
+        raise last_exception if last_exception else Exception("Unknown error")
+
+    def _build_request_kwargs(self, enable_thinking: bool, use_json: bool, kwargs: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        kwargs = kwargs or {}
+        if self.can_enable_thinking:
+            kwargs["extra_body"] = {"enable_thinking": enable_thinking}
+        if use_json and self.can_use_json:
+            kwargs["response_format"] = {"type": "json_object"}
+        return kwargs
+
+    def _sampling_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "max_tokens": params.get("max_tokens", self.default_parameters.get("max_tokens", 8192)),
+            "temperature": params.get("temperature", self.default_parameters.get("temperature", 0.7)),
+            "top_p": params.get("top_p", self.default_parameters.get("top_p", 0.9)),
+        }
+
+    def _extract_delta(self, chunk) -> str:
+        """提取流式分片中的文本增量；思考内容 (reasoning_content) 不计入回复"""
+        try:
+            if getattr(chunk, "choices", None):
+                delta = getattr(chunk.choices[0], "delta", None)
+                return getattr(delta, "content", None) or ""
+        except Exception as e:
+            self.logger.error(f"提取流式增量失败: {e}")
+        return ""
         
 
     def set_parameters(self, **params) -> None:
@@ -156,8 +428,11 @@ class OpenAIAPIInterface(LLMAPIInterface):
         self.can_use_json = self.config.get("can_use_json", False)
 
         self.default_parameters = self.config.get("default_params", {})
+        self.response_cache, self.cache_nondeterministic = _create_response_cache(self.config)
+        self.token_bucket = _get_token_bucket(self.config, self.base_url, self.api_key)
+        self.backoff = _create_backoff(self.config)
+
 
-    
     def _extract_content(self, response, elapsed: float = 0.0) -> Dict[str, Any]:
         """提取响应内容、token 用量和响应用时
 
@@ -186,8 +461,8 @@ class OpenAIAPIInterface(LLMAPIInterface):
         # 有的 API 将毫秒级值存储在 usage 扩展字段中
         usage_dict: Optional[Dict[str, int]] = None
         try:
-            if hasattr(response, "usage") and response.usage:
-                usage_obj = response.usage
+            usage_obj = getattr(response, "usage", None)
+            if usage_obj:
                 prompt_tokens = getattr(usage_obj, "prompt_tokens", 0)
                 completion_tokens = getattr(usage_obj, "completion_tokens", 0)
                 total_tokens = getattr(usage_obj, "total_tokens", 0)
@@ -218,14 +493,12 @@ class OpenAIAPIInterface(LLMAPIInterface):
             response_time_s = elapsed
 
         # 提取文本内容
+        # 正常响应直接按属性取值，只有结构不符时才走异常分支
         content = ""
         try:
-            if hasattr(response, "choices") and response.choices:
-                choice = response.choices[0]
-                if hasattr(choice, "message") and hasattr(choice.message, "content"):
-                    content = choice.message.content or ""
-            else:
-                self.logger.warning("无法从响应中提取内容")
+            content = response.choices[0].message.content or ""
+        except (AttributeError, IndexError, TypeError):
+            self.logger.warning("无法从响应中提取内容")
         except Exception as e:
             self.logger.error(f"提取响应内容失败: {e}")
 
@@ -267,8 +540,12 @@ class OpenAIAPIInterface(LLMAPIInterface):
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 
+@register_api_type("requests")
 class RequestsAPIInterface(LLMAPIInterface):
+    _JSON_FORMAT_FIELD = b',"response_format":{"type":"json_object"}'
+
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.logger = get_logger(__name__)
@@ -277,34 +554,131 @@ class RequestsAPIInterface(LLMAPIInterface):
     async def generate_response(self, prompt: str, use_json: bool = False, **kwargs) -> str:
         # 实现调用SiliconFlow API生成响应的逻辑
         last_exception = None
-        self.payload["messages"] = [{"role": "user", "content": prompt}]
-        if use_json:
-            self.payload["response_format"] = {"type": "json_object"}
+        body = self._encode_body(prompt, use_json)
+
+        cache_key = None
+        if self.response_cache is not None and (self.temperature == 0 or self.cache_nondeterministic):
+            cache_key = ExactResponseCache.make_key(self.url, body.decode("utf-8"))
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         for attempt in range(self.max_retries):
             try:
+                if self.token_bucket is not None:
+                    await self.token_bucket.acquire()
                 st_time = time.time()
 
                 def _do_request():
-                    return requests.post(
-                        self.url, headers=self.headers, json=self.payload, timeout=10
+                    return self.session.post(
+                        self.url, headers=self.headers, data=body, timeout=(3.05, 10)
                     )
 
                 ret = await asyncio.to_thread(_do_request)
+                # HTTP 错误抛出 HTTPError：429 / 5xx 进入重试（退避时可读取 Retry-After），其余直接失败
+                ret.raise_for_status()
                 elapsed = time.time() - st_time
                 extracted = self._extract_content(ret, elapsed=elapsed)
+                if cache_key is not None and extracted["content"]:
+                    self.response_cache.put(cache_key, extracted)
                 return extracted
 
             except Exception as e:
+                if not self._is_retryable(e):
+                    self.logger.error(f"请求失败，不重试: {e}")
+                    raise
                 last_exception = e
                 self.logger.warning(f"请求失败 (尝试 {attempt + 1}/{self.max_retries}): {e}")
 
                 if attempt < self.max_retries - 1:
-                    delay = self.retry_delay * (2**attempt) + random.uniform(0, 1)
-                    await asyncio.sleep(delay)
+                    await asyncio.sleep(self.backoff.delay(attempt, e))
 
         # 所有重试都失败
         raise last_exception
 
+    async def generate_response_stream(self, prompt: str, params: Dict[str, Any] = None, enable_thinking: bool = False, use_json: bool = False, **kwargs) -> AsyncGenerator[str, None]:
+        """
+        以 stream=True 请求，逐行解析 SSE ("data: {...}") 并产出文本增量。
+        与 OpenAIAPIInterface 一致，只在尚未产出任何内容时重试。
+        """
+        last_exception = None
+        body = self._encode_body(prompt, use_json, stream=True)
+
+        def _open_stream():
+            resp = self.session.post(
+                self.url, headers=self.headers, data=body, timeout=(3.05, 60), stream=True
+            )
+            resp.raise_for_status()
+            return resp
+
+        for attempt in range(self.max_retries):
+            yielded = False
+            resp = None
+            try:
+                if self.token_bucket is not None:
+                    await self.token_bucket.acquire()
+                st_time = time.time()
+                resp = await asyncio.to_thread(_open_stream)
+                lines = resp.iter_lines()
+                while True:
+                    line = await asyncio.to_thread(next, lines, None)
+                    if line is None:
+                        break
+                    if not line.startswith(b"data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == b"[DONE]":
+                        break
+                    delta = self._extract_delta(json_loads(data))
+                    if delta:
+                        yielded = True
+                        yield delta
+                self.logger.debug(f"Stream response finished in {time.time() - st_time:.2f}s")
+                return
+
+            except Exception as e:
+                if yielded or not self._is_retryable(e):
+                    raise
+                last_exception = e
+                self.logger.warning(f"流式请求失败 (尝试 {attempt + 1}/{self.max_retries}): {e}")
+
+                if attempt < self.max_retries - 1:
+                    await asyncio.sleep(self.backoff.delay(attempt, e))
+            finally:
+                if resp is not None:
+                    resp.close()
+
+        raise last_exception
+
+    @staticmethod
+    def _is_retryable(exc: BaseException) -> bool:
+        """限流 (429) 和服务端错误 (5xx) 值得重试；400/401/403/404 等请求本身的错误重试也不会成功"""
+        if isinstance(exc, requests.HTTPError) and exc.response is not None:
+            status = exc.response.status_code
+            return status == 429 or status >= 500
+        return True
+
+    def _encode_body(self, prompt: str, use_json: bool, stream: bool = False) -> bytes:
+        """固定字段在初始化时已编码好，这里只编码本次的 messages；不改写共享的 self.payload"""
+        prefix = self._stream_payload_prefix if stream else self._payload_prefix
+        return (
+            prefix
+            + (self._JSON_FORMAT_FIELD if use_json else b"")
+            + b',"messages":'
+            + json_dumps_bytes([{"role": "user", "content": prompt}])
+            + b"}"
+        )
+
+    def _extract_delta(self, chunk: Dict[str, Any]) -> str:
+        """提取 SSE 分片中的文本增量；思考内容 (reasoning_content) 不计入回复"""
+        try:
+            choices = chunk.get("choices") or []
+            if choices:
+                return (choices[0].get("delta") or {}).get("content") or ""
+        except Exception as e:
+            self.logger.error(f"提取流式增量失败: {e}")
+        return ""
+
     def set_parameters(self, **params) -> None:
         # 设置参数
         for key, value in params.items():
@@ -338,9 +712,25 @@ class RequestsAPIInterface(LLMAPIInterface):
             "n": 1,
             "stream": self.stream,
         }
+        # 不变的字段只编码一次，去掉结尾的 "}"，每次请求在后面拼上 messages
+        fixed_fields = {k: v for k, v in self.payload.items() if k != "messages"}
+        self._payload_prefix = json_dumps_bytes(fixed_fields)[:-1]
+        self._stream_payload_prefix = json_dumps_bytes({**fixed_fields, "stream": True})[:-1]
 
         self.max_retries = self.config.get("max_retries", 3)
         self.retry_delay = self.config.get("retry_delay", 0.5)
+        self.response_cache, self.cache_nondeterministic = _create_response_cache(self.config)
+        self.token_bucket = _get_token_bucket(self.config, self.url, self.api_key)
+        self.backoff = _create_backoff(self.config)
+
+        # 长连接复用 TCP/TLS；重试由 generate_response 自己控制，适配器不再重试
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def close(self) -> None:
+        self.session.close()
 
     def _extract_content(self, response: requests.Response, elapsed: float = 0.0) -> Dict[str, Any]:
         """提取响应内容、token 用量和响应用时
@@ -352,7 +742,8 @@ class RequestsAPIInterface(LLMAPIInterface):
         Returns:
             {"content": str, "usage": Optional[dict], "response_time_s": float}
         """
-        data = response.json()
+        # 直接解析原始字节，省去 response.json() 先解码成文本的一步（装了 orjson 时更快）
+        data = json_loads(response.content)
         usage_dict: Optional[Dict[str, int]] = None
         response_time_s: float = elapsed
 
@@ -390,12 +781,9 @@ class RequestsAPIInterface(LLMAPIInterface):
         # 提取文本内容
         content = ""
         try:
-            if "choices" in data and data["choices"]:
-                choice = data["choices"][0]
-                if "message" in choice and "content" in choice["message"]:
-                    content = choice["message"]["content"] or ""
-            else:
-                self.logger.warning("无法从响应中提取内容")
+            content = data["choices"][0]["message"]["content"] or ""
+        except (KeyError, IndexError, TypeError):
+            self.logger.warning("无法从响应中提取内容")
         except Exception as e:
             self.logger.error(f"提取响应内容失败: {e}")
 
@@ -419,6 +807,74 @@ class RequestsAPIInterface(LLMAPIInterface):
 
 
 
+"""
+多个端点/密钥之间做负载均衡的LLM API接口
+"""
+
+
+@register_api_type("load_balanced")
+class LoadBalancedAPIInterface(LLMAPIInterface):
+    """
+    持有多个子接口（不同的端点或 API key），每次请求交给进行中请求最少的子接口，
+    并列时按轮转顺序选择，以绕过单个 key 的限流上限
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        self.logger = get_logger(__name__)
+        child_configs = config.get("children", [])
+        if not child_configs:
+            raise ValueError("load_balanced 接口至少需要一个子接口配置 (children)")
+        self.children: List[LLMAPIInterface] = [LLMAPIFactory.create_interface(c) for c in child_configs]
+        # 采样参数沿用第一个子接口的默认值，LLMModule 会在其基础上覆盖
+        self.default_parameters = dict(getattr(self.children[0], "default_parameters", {}))
+        self._inflight = [0] * len(self.children)
+        self._next = 0
+        self._lock = Lock()
+
+    def _acquire(self) -> int:
+        with self._lock:
+            n = len(self.children)
+            order = [(self._next + i) % n for i in range(n)]
+            idx = min(order, key=lambda i: self._inflight[i])
+            self._inflight[idx] += 1
+            self._next = (idx + 1) % n
+            return idx
+
+    def _release(self, idx: int) -> None:
+        with self._lock:
+            self._inflight[idx] -= 1
+
+    async def generate_response(self, prompt: str, params: Dict[str, Any], enable_thinking: bool = False, use_json: bool = False, **kwargs) -> Dict[str, Any]:
+        idx = self._acquire()
+        try:
+            return await self.children[idx].generate_response(
+                prompt, params=params, enable_thinking=enable_thinking, use_json=use_json, **kwargs
+            )
+        finally:
+            self._release(idx)
+
+    async def generate_response_stream(self, prompt: str, params: Dict[str, Any], enable_thinking: bool = False, use_json: bool = False, **kwargs) -> AsyncGenerator[str, None]:
+        idx = self._acquire()
+        try:
+            async for delta in self.children[idx].generate_response_stream(
+                prompt, params=params, enable_thinking=enable_thinking, use_json=use_json, **kwargs
+            ):
+                yield delta
+        finally:
+            self._release(idx)
+
+    def set_parameters(self, **params) -> None:
+        for child in self.children:
+            child.set_parameters(**params)
+
+    def get_interface_info(self) -> Dict[str, Any]:
+        return {
+            "type": "LoadBalancedAPIInterface",
+            "children": [child.get_interface_info() for child in self.children],
+        }
+
+
 """
 LLM API接口工厂
 根据配置创建对应的LLM API接口实例
@@ -442,19 +898,20 @@ class LLMAPIFactory:
             key = LLMAPIFactory._make_cache_key(config)
             with LLMAPIFactory._cache_lock:
                 cached = LLMAPIFactory._client_cache.get(key)
-                if cached is not None:
-                    return cached
-                client = LLMAPIFactory._create_interface_uncached(config)
-                LLMAPIFactory._client_cache[key] = client
-                return client
+            if cached is not None:
+                return cached
+            # 在锁外构造：load_balanced 会在构造函数里递归调用 create_interface 创建子接口
+            client = LLMAPIFactory._create_interface_uncached(config)
+            with LLMAPIFactory._cache_lock:
+                # 并发构造同一配置时以先写入的实例为准
+                return LLMAPIFactory._client_cache.setdefault(key, client)
 
         return LLMAPIFactory._create_interface_uncached(config)
 
     @staticmethod
     def _create_interface_uncached(config: Dict[str, Any]) -> LLMAPIInterface:
         api_type = config.get("api_type", "openai").lower()
-        if api_type == "openai":
-            return OpenAIAPIInterface(config)
-        if api_type == "requests":
-            return RequestsAPIInterface(config)
-        raise ValueError(f"未知的LLM API类型: {api_type}")
+        interface_cls = _API_REGISTRY.get(api_type)
+        if interface_cls is None:
+            raise ValueError(f"未知的LLM API类型: {api_type}")
+        return interface_cls(config)
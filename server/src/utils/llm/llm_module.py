@@ -1,7 +1,8 @@
+import time
 from src.utils.llm.llm_api_interface import LLMAPIInterface
 from src.utils.llm.prompt_manager import PromptTemplate
 from src.utils.logger import get_logger
-from typing import Dict, List, Any
+from typing import AsyncGenerator, Dict, List, Any
 
 class LLMModule:
     def __init__(self, module_name: str, llm_config:dict, prompt_template: PromptTemplate, interface: LLMAPIInterface) -> None:
@@ -36,6 +37,24 @@ class LLMModule:
         )
         return response["content"]
     
+    async def generate_response_stream(self, **kwargs) -> AsyncGenerator[str, None]:
+        """与 generate_response 相同，但逐段产出 LLM 的文本增量"""
+        prompt = self.prompt_template.render(**kwargs)
+        st_time = time.time()
+        parts: List[str] = []
+        async for delta in self.llm_client.generate_response_stream(
+            prompt,
+            params=self.params,
+            enable_thinking=self.enable_thinking,
+            use_json=self.use_json,
+        ):
+            parts.append(delta)
+            yield delta
+        response_time_s = time.time() - st_time
+        # 流式响应不返回 token 用量
+        self._recent_response = {"content": "".join(parts), "usage": None, "response_time_s": response_time_s}
+        self.logger.debug(f"Streamed response time: {response_time_s:.2f}s")
+
     @property
     def recent_response(self):
         """获取最近一次的响应结果"""
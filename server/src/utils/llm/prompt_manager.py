@@ -4,29 +4,36 @@ Prompt模板管理器
 管理和渲染各种Prompt模板
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import os
 import json
 from pathlib import Path
-from jinja2 import Template, Environment, FileSystemLoader
+from jinja2 import Template, Environment, meta
 
+from src.utils.helpers import json_loads
 from src.utils.logger import get_logger
 
 
+# 所有模板共用一个环境（过滤器、全局变量等只建一份）；模板来自 JSON，不需要检查文件变更
+_shared_env = Environment(auto_reload=False)
+
+
 class PromptTemplate:
     """Prompt模板类"""
 
-    def __init__(self, template_str: str, var_list: list[str] = [], name: str = ""):
+    def __init__(self, template_str: str, var_list: list[str] = [], name: str = "", env: Optional[Environment] = None):
         """初始化模板
 
         Args:
             template_str: 模板字符串
             name: 模板名称
+            env: 编译模板所用的 Jinja2 环境，不传时使用模块共享的环境
         """
         self.name = name
         self.template_str = template_str
         self.var_list = var_list
-        self.template: Template = Template(template_str)
+        # 只在创建时编译一次，之后每次 render 直接执行编译好的代码
+        self.template: Template = (env or _shared_env).from_string(template_str)
 
     def render(self, **kwargs) -> str:
         """渲染模板
@@ -70,6 +77,7 @@ class PromptManager:
         self.logger = get_logger(__name__)
         self.config = config
         self.templates: Dict[str, PromptTemplate] = {}
+        self.env = _shared_env
 
         # 从配置文件加载模板
         if "template_dir" in config:
@@ -93,22 +101,29 @@ class PromptManager:
 
         for file_path in template_path.glob("*.json"):
             try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    template_data = json.load(f)
-
-                name = template_data.get("name", file_path.stem)
-                template_str = template_data.get("template", "")
-                if isinstance(template_str, list):
-                    template_str = "\n".join(template_str)
-
-                if template_str:
-                    var_list = self._extract_template_variables(template_str)
-                    self.templates[name] = PromptTemplate(template_str, var_list, name)
+                loaded = self._load_one(file_path)
+                if loaded:
+                    name, template = loaded
+                    self.templates[name] = template
                     self.logger.info(f"加载模板: {name}")
 
             except Exception as e:
                 self.logger.error(f"加载模板文件失败 {file_path}: {e}")
 
+    def _load_one(self, file_path: Path) -> Optional[Tuple[str, PromptTemplate]]:
+        """读取并编译单个模板文件，模板内容为空时返回 None"""
+        template_data = json_loads(file_path.read_bytes())
+
+        name = template_data.get("name", file_path.stem)
+        template_str = template_data.get("template", "")
+        if isinstance(template_str, list):
+            template_str = "\n".join(template_str)
+
+        if not template_str:
+            return None
+        var_list = self._extract_template_variables(template_str)
+        return name, PromptTemplate(template_str, var_list, name, env=self.env)
+
     def get_template(self, name: str) -> Optional[PromptTemplate]:
         """获取模板
 
@@ -154,7 +169,7 @@ class PromptManager:
             raise ValueError("JSON数据中缺少'name'或'template'字段")
 
         var_list = self._extract_template_variables(template_str)
-        self.templates[name] = PromptTemplate(template_str, var_list, name)
+        self.templates[name] = PromptTemplate(template_str, var_list, name, env=self.env)
         self.logger.info(f"添加模板: {name}")
 
     def add_template_from_file(self, file_path: str) -> None:
@@ -178,7 +193,7 @@ class PromptManager:
             template_str: 模板字符串
         """
         var_list = self._extract_template_variables(template_str)
-        self.templates[name] = PromptTemplate(template_str, var_list, name)
+        self.templates[name] = PromptTemplate(template_str, var_list, name, env=self.env)
         self.logger.info(f"添加模板: {name}")
 
     def remove_template(self, name: str) -> bool:
@@ -232,10 +247,6 @@ class PromptManager:
         Returns:
             变量名列表
         """
-        import re
-
-        # 简单的变量提取（可以改进）
-        # 匹配形如 {{ variable }} 或 {{ object.property }} 的模板变量
-        pattern = r"\{\{\s*(\w+)(?:\.\w+)*\s*\}\}"
-        variables = re.findall(pattern, template_str)
-        return list(set(variables))
+        # 遍历 Jinja2 语法树，{% for %} / {% if %} / 过滤器参数中的变量也能找到；
+        # 循环变量和 {% set %} 定义的变量不算作需要传入的模板变量
+        return sorted(meta.find_undeclared_variables(self.env.parse(template_str)))
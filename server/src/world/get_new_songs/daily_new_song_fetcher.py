@@ -7,18 +7,16 @@ sys.path.insert(0, str(cwd))
 import datetime
 from src.utils.logger import get_logger
 import requests
-from bs4 import BeautifulSoup
 import json
 import logging
 import re
-import time
 import subprocess
 import shutil
-from typing import Dict, Any, Optional, List, Set
+from typing import Dict, Any, Optional, List, Set, Tuple
 from pathlib import Path
 from urllib.parse import quote
 from src.utils.helpers import load_config
-from src.world.get_new_songs.vcpedia_fetcher import VCPediaFetcher
+from src.world.get_new_songs.vcpedia_fetcher import VCPediaFetcher, parse_content_soup, safe_entity_name
 from src.subconscious.music_knowledge.song_database import init_song_db, get_song_session, Song
 
 logger = get_logger("DailyNewSongFetcher")
@@ -86,7 +84,7 @@ def fetch_song_list_from_template(url: str, timeout: int = 20) -> List[str]:
     }
     html = _fetch_html(url, headers=headers, timeout=timeout)
 
-    soup = BeautifulSoup(html, "html.parser")
+    soup = parse_content_soup(html)
     content = soup.find("div", id="mw-content-text") or soup
 
     # 过滤关键词（模板结构词，不是歌曲）
@@ -140,7 +138,7 @@ def fetch_song_list_from_template(url: str, timeout: int = 20) -> List[str]:
 
 
 def _safe_song_name(name: str) -> str:
-    return "".join([c for c in name if c.isalnum() or c in (' ', '-', '_')]).strip()
+    return safe_entity_name(name)
 
 
 def _song_exists(db, song_name: str) -> bool:
@@ -152,6 +150,16 @@ def _song_exists(db, song_name: str) -> bool:
     return song is not None
 
 
+def _existing_song_keys(db) -> Tuple[Set[str], Set[str]]:
+    """一次性读出库中已有歌曲的 (name 集合, safe_name 集合)，代替逐首查询。"""
+    names: Set[str] = set()
+    safe_names: Set[str] = set()
+    for name, safe_name in db.query(Song.name, Song.safe_name):
+        names.add(name)
+        safe_names.add(safe_name)
+    return names, safe_names
+
+
 def _extract_song_fields(data: Dict[str, Any]) -> Dict[str, str]:
     infobox = data.get("infobox") or {}
     uploader = infobox.get("UP主") or infobox.get("投稿者") or infobox.get("发布者") or ""
@@ -191,27 +199,33 @@ def _split_spaced_lyrics(spaced_lyrics: str) -> List[str]:
     return ret
 
 
-def _append_keywords_to_files(song_name: str, spaced_lyrics: str) -> None:
+def _append_keywords_to_files(songs: List[Tuple[str, str]]) -> None:
+    """把一批 (歌名, 带空格歌词) 追加到关键词文件，每个文件只打开一次。"""
+    if not songs:
+        return
     KNOWLEDGE_DIR.mkdir(parents=True, exist_ok=True)
 
-    lyric_lines = _split_spaced_lyrics(spaced_lyrics)
-    lyric_keywords = [f"{lyric}=>{lyric}是《{song_name}》的歌词" for lyric in lyric_lines]
+    lyric_keywords = [
+        f"{lyric}=>{lyric}是《{song_name}》的歌词\n"
+        for song_name, spaced_lyrics in songs
+        for lyric in _split_spaced_lyrics(spaced_lyrics)
+    ]
 
     with open(SONG_NAME_KEYWORDS_FILE, "a", encoding="utf-8") as name_file:
-        name_file.write(f"{song_name}\n")
+        name_file.writelines(f"{song_name}\n" for song_name, _ in songs)
 
     if lyric_keywords:
         with open(SONG_LYRIC_KEYWORDS_FILE, "a", encoding="utf-8") as lyric_file:
-            for line in lyric_keywords:
-                lyric_file.write(f"{line}\n")
+            lyric_file.writelines(lyric_keywords)
 
-def do_one_song(db, fetcher: VCPediaFetcher, song_name, update = False) -> bool:
+def do_one_song(db, fetcher: VCPediaFetcher, song_name, update = False, keyword_buffer: Optional[List[Tuple[str, str]]] = None) -> bool:
+    """抓取并入库一首歌；传入 keyword_buffer 时关键词暂存其中，由调用方批量写入文件。"""
     if db and _song_exists(db, song_name) and not update:
         logger.info(f"已存在，跳过: {song_name}")
         return False
 
     logger.info(f"开始抓取并入库: {song_name}")
-    data = fetcher.fetch_entity_description(song_name)
+    data = fetcher.fetch_entity_description(song_name, use_cache=not update)
     if not data:
         return False
 
@@ -243,8 +257,12 @@ def do_one_song(db, fetcher: VCPediaFetcher, song_name, update = False) -> bool:
             logger.error(f"入库失败 {song_name}: {e}")
             return False
 
+    keyword_entry = (song_name, fields["spaced_lyrics"])
+    if keyword_buffer is not None:
+        keyword_buffer.append(keyword_entry)
+        return True
     try:
-        _append_keywords_to_files(song_name, fields["spaced_lyrics"])
+        _append_keywords_to_files([keyword_entry])
     except Exception as e:
         logger.error(f"写入失败 {song_name}: {e}")
 
@@ -264,20 +282,40 @@ def sync_daily_new_songs(song_knowledge_config: Dict[str, Any], llm_module: Any
 
     added: List[str] = []
     failed: List[str] = []
+    fetcher: Optional[VCPediaFetcher] = None
+    pending_keywords: List[Tuple[str, str]] = []
     try:
         songs = fetch_song_list_from_template(TEMPLATE_URL)
         fetcher = VCPediaFetcher(crawler_cfg, llm_module=llm_module)
+        existing_names, existing_safe_names = _existing_song_keys(db)
+        # safe_name -> 歌名；同一 safe_name 只处理第一次出现的歌名，入库时它们会被视为同一首歌
+        pending: Dict[str, str] = {}
+        for name in songs:
+            safe_name = _safe_song_name(name)
+            if name in existing_names or safe_name in existing_safe_names or safe_name in pending:
+                continue
+            pending[safe_name] = name
+        # 先并发抓取所有未入库歌曲的页面，之后逐首解析入库（数据库写入保持串行）
+        fetcher.prefetch_pages(list(pending.values()))
 
         for i, song_name in enumerate(songs, start=1):
-            if do_one_song(db, fetcher, song_name):
+            if pending.get(_safe_song_name(song_name)) != song_name:
+                logger.info(f"已存在，跳过: {song_name}")
+                failed.append(song_name)
+                continue
+            if do_one_song(db, fetcher, song_name, keyword_buffer=pending_keywords):
                 added.append(song_name)
             else:
                 failed.append(song_name)
 
-            time.sleep(0.8)
-
         return {"added": added, "failed": failed}
     finally:
+        try:
+            _append_keywords_to_files(pending_keywords)
+        except Exception as e:
+            logger.error(f"关键词写入失败: {e}")
+        if fetcher is not None:
+            fetcher.close()
         db.close()
 
 # if __name__ == "__main__":
@@ -5,15 +5,69 @@ cwd = os.getcwd()
 sys.path.insert(0, str(cwd))
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
 import json
 import os
 import re
 import asyncio
+import time
 from typing import Dict, Any, Optional, List
 from pathlib import Path
 from src.utils.logger import get_logger
-from src.utils.helpers import load_config
+from src.utils.helpers import load_config, json_loads, json_dumps_bytes
+
+try:
+    import lxml  # noqa: F401  # 可选依赖：C 实现的解析器，比内置 html.parser 快数倍
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# 单列信息框中“标题行”的关键词，按优先级排列：一格含多个关键词时取最靠前的；
+# “作编曲”排在“编曲”之前，避免被截成“编曲”
+INFOBOX_TITLE_KEYWORDS = ("演唱", "作词", "作曲", "作编曲", "编曲", "PV", "UP主", "曲绘")
+_UNSAFE_NAME_CHARS_RE = re.compile(r"[^\w \-]")
+_STAT_SENTENCE_RE = re.compile(r"截至[^。！？\n]*?收藏")
+_INFOBOX_TITLE_RE = re.compile("|".join(sorted(map(re.escape, INFOBOX_TITLE_KEYWORDS), key=len, reverse=True)))
+
+
+def safe_entity_name(name: str) -> str:
+    """仅保留字母数字（含中日韩文字）、空格、- 和 _，用作文件名/数据库 safe_name。"""
+    return _UNSAFE_NAME_CHARS_RE.sub("", name).strip()
+
+
+# MediaWiki 正文区域；只构建这一棵子树，跳过导航栏、侧边栏、页脚等
+_CONTENT_STRAINER = SoupStrainer("div", id="mw-content-text")
+
+
+def parse_content_soup(html: str) -> BeautifulSoup:
+    """只解析页面正文 (div#mw-content-text)，页面没有该区域时退回整页解析。"""
+    soup = BeautifulSoup(html, HTML_PARSER, parse_only=_CONTENT_STRAINER)
+    if soup.find(True) is None:
+        soup = BeautifulSoup(html, HTML_PARSER)
+    return soup
+
+
+class _AsyncRateLimiter:
+    """在并发任务间共享的限速器：按固定间隔依次放行，保证整体请求速率不超过 max_rate / time_period。"""
+
+    def __init__(self, max_rate: float, time_period: float = 1.0):
+        self._interval = time_period / max_rate
+        self._lock = asyncio.Lock()
+        self._next_slot = 0.0
+
+    async def __aenter__(self):
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self._interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
 
 class VCPediaFetcher:
     def __init__(self, config: Dict[str, Any], llm_module: Any | None = None):
@@ -32,41 +86,113 @@ class VCPediaFetcher:
         self.data_dir = Path(config.get("data_dir", "data/crawled_data"))
         # Default save directory
         self.default_save_dir = Path(crawler_config.get("output_dir", "data/crawled_data"))
-        
+        # 解析结果（含 LLM 摘要）落盘缓存，重复运行时直接命中，无需再次抓取/总结
+        self.cache_results = config.get("cache_results", True)
+        # 缓存超过该时长（秒）视为过期，重新抓取以拿到词条的后续补充；<= 0 表示永不过期
+        self.cache_max_age_seconds = float(config.get("cache_max_age_seconds", 86400))
+        self.max_requests_per_second = float(crawler_config.get("max_requests_per_second", 2.0))
+        self.max_concurrency = max(1, int(crawler_config.get("max_concurrency", 4)))
+        self.llm_max_concurrency = max(1, int(config.get("llm_max_concurrency", 4)))
+        self._prefetched_entities: Dict[str, Optional[Dict[str, Any]]] = {}
+
         self.session = requests.Session()
         self.session.headers.update({
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         })
+        # 同一站点的大量请求复用连接池，避免每次重新握手；瞬时错误/限流由 Retry 退避重试
+        retry = Retry(total=5, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504], allowed_methods=["GET"])
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(self.max_concurrency, 10), max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
-    def fetch_entity_description(self, entity_name: str, short_summary: bool = True) -> Dict[str, Any]:
+    def close(self) -> None:
+        """释放 HTTP 连接池与未消费的预取结果。"""
+        self._prefetched_entities.clear()
+        self.session.close()
+
+    def fetch_entity_description(self, entity_name: str, short_summary: bool = True, use_cache: bool = True) -> Dict[str, Any]:
         """
         Fetch entity description from cache or VCPedia.
         Returns a JSON string of the entity data or empty string if not found.
+        use_cache=False forces a fresh crawl (the result still refreshes the cache).
         """
         if not self.activated:
             return ""
         # 1. Check local cache
-        cached_data = self._check_cache(entity_name)
+        cached_data = self._check_cache(entity_name) if use_cache else None
         if cached_data:
             self.logger.info(f"Found {entity_name} in cache.")
             return cached_data
 
-        # 2. Crawl
-        self.logger.info(f"Trying to crawl {entity_name} from VCPedia...")
-        html = self._fetch_page(entity_name)
-        if html:
-            try:
-                data = self._parse_page(html, entity_name)
-                if data:
-                    if data["type"] == "Song":
-                        data["short_summary"] = self._llm_summarize(data)
-                    return data
-            except Exception as e:
-                self.logger.error(f"Error parsing {entity_name}: {e}")
-        
-        return None
-    
+        # 2. Crawl (or take the result prepared by prefetch_pages)
+        if entity_name in self._prefetched_entities:
+            data = self._prefetched_entities.pop(entity_name)
+        else:
+            self.logger.info(f"Trying to crawl {entity_name} from VCPedia...")
+            data = self._build_entity_data(entity_name, self._fetch_page(entity_name))
+        if data and self.cache_results:
+            self._save_data(data)
+        return data
+
+    def _build_entity_data(self, entity_name: str, html: Optional[str]) -> Optional[Dict[str, Any]]:
+        data = self._parse_entity_page(entity_name, html)
+        if data and data["type"] == "Song":
+            data["short_summary"] = self._llm_summarize(data)
+        return data
+
+    def _parse_entity_page(self, entity_name: str, html: Optional[str]) -> Optional[Dict[str, Any]]:
+        if not html:
+            return None
+        try:
+            return self._parse_page(html, entity_name) or None
+        except Exception as e:
+            self.logger.error(f"Error parsing {entity_name}: {e}")
+            return None
+
+    def prefetch_pages(self, page_names: List[str]) -> None:
+        """
+        并发抓取并解析一批页面（歌曲条目同时生成 LLM 摘要），之后的 fetch_entity_description 会直接复用。
+        抓取并发数由 vcpedia.max_concurrency 限制，所有请求共享 vcpedia.max_requests_per_second 的速率上限；
+        LLM 摘要并发数由 llm_max_concurrency 单独限制。
+        """
+        if not self.activated:
+            return
+        page_names = [name for name in page_names if self._cache_file(name) is None]
+        if not page_names:
+            return
+        self.logger.info(f"Prefetching {len(page_names)} pages from VCPedia (concurrency={self.max_concurrency})...")
+        entities = asyncio.run(self._prefetch_pages_async(page_names))
+        self._prefetched_entities.update(entities)
+
+    async def _prefetch_pages_async(self, page_names: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        llm_semaphore = asyncio.Semaphore(self.llm_max_concurrency)
+        limiter = _AsyncRateLimiter(self.max_requests_per_second)
+
+        async def fetch_one(page_name: str):
+            async with semaphore:
+                async with limiter:
+                    html = await asyncio.to_thread(self._fetch_page, page_name)
+            data = self._parse_entity_page(page_name, html)
+            if data and data["type"] == "Song":
+                async with llm_semaphore:
+                    data["short_summary"] = await self._llm_summarize_async(data)
+            return page_name, data
+
+        results = await asyncio.gather(*(fetch_one(name) for name in page_names), return_exceptions=True)
+        entities: Dict[str, Optional[Dict[str, Any]]] = {}
+        for result in results:
+            if isinstance(result, BaseException):
+                self.logger.error(f"Error prefetching page: {result}")
+                continue
+            page_name, data = result
+            entities[page_name] = data
+        return entities
+
     def _llm_summarize(self, data: Dict[str, Any]) -> str:
+        return asyncio.run(self._llm_summarize_async(data))
+
+    async def _llm_summarize_async(self, data: Dict[str, Any]) -> str:
         summary_raw = "\n".join([str(x) for x in data.get("summary", []) if x])
         fallback = summary_raw[:100].strip() if summary_raw else ""
         if not data:
@@ -74,8 +200,8 @@ class VCPediaFetcher:
 
         if self.use_llm and self.llm_module is not None:
             try:
-                data_payload = json.dumps(data, ensure_ascii=False, default=str)
-                result = asyncio.run(self.llm_module.generate_response(song_data=data_payload))
+                data_payload = json_dumps_bytes(data, default=str).decode("utf-8")
+                result = await self.llm_module.generate_response(song_data=data_payload)
                 result = str(result or "").strip()
                 return result if result else fallback
             except Exception as e:
@@ -84,38 +210,25 @@ class VCPediaFetcher:
 
         return fallback
 
-        try:
-            if not self.use_llm or self.llm_client is None:
-                self.logger.error("knowledge.llm 配置缺失，使用回退摘要")
-                return fallback
-
-            
-            data_payload = json.dumps(data, ensure_ascii=False, default=str)
-            prompt = (
-                "请基于以下歌曲数据(JSON)总结为不超过120字的中文，且仅保留三类信息："
-                "1) 发布者(UP主)/演唱者/作词作曲等核心制作信息；"
-                "2) 歌曲意义(如所属系列、重要演出或传播节点)；"
-                "3) 歌曲主旨与大意。"
-                "不要输出无关统计信息，不要编造。\n\n"
-                f"歌曲数据：{data_payload}\n\n"
-                "请直接输出摘要正文。"
-            )
-            return fallback
-            result = ((result or {}).get("content", "") if isinstance(result, dict) else str(result)).strip()
-            return result if result else fallback
-        except Exception as e:
-            self.logger.error(f"LLM summarize failed: {e}")
-            return fallback
+    def _cache_file(self, entity_name: str) -> Optional[Path]:
+        """返回未过期的缓存文件；不存在或已过期时返回 None"""
+        safe_name = safe_entity_name(entity_name)
+        oldest_mtime = time.time() - self.cache_max_age_seconds if self.cache_max_age_seconds > 0 else None
+        for cache_dir in dict.fromkeys([self.data_dir, self.default_save_dir]):
+            file_path = cache_dir / f"{safe_name}.json"
+            try:
+                mtime = file_path.stat().st_mtime
+            except OSError:
+                continue
+            if oldest_mtime is None or mtime >= oldest_mtime:
+                return file_path
+        return None
 
     def _check_cache(self, entity_name: str) -> Optional[Dict[str, Any]]:
-        # Normalize name for filename
-        safe_name = "".join([c for c in entity_name if c.isalnum() or c in (' ', '-', '_')]).strip()
-        
-        file_path = self.data_dir / f"{safe_name}.json"
-        if file_path.exists():
+        file_path = self._cache_file(entity_name)
+        if file_path is not None:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                return json_loads(file_path.read_bytes())
             except Exception as e:
                 self.logger.error(f"Error reading cache {file_path}: {e}")
         return None
@@ -131,81 +244,87 @@ class VCPediaFetcher:
             self.logger.error(f"Error fetching {url}: {e}")
             return None
 
-    def _get_data_from_infobox(self, infobox_table, single_col = False) -> Dict[str, str]:
+    @staticmethod
+    def _infobox_row_value(val_col) -> str:
+        for br in val_col.find_all('br'):
+            br.replace_with(',')
+        return val_col.get_text(strip=True)
+
+    def _get_data_from_infobox(self, infobox_table) -> Dict[str, str]:
+        """只处理 “键 | 值” 两列行的信息表。"""
         infobox_data = {}
-        rows = infobox_table.find_all('tr')
-        preserved_title = None
+        for row in infobox_table.find_all('tr'):
+            if 'display:none' in row.get('style', ''):
+                continue
+            cols = row.find_all(['th', 'td'])
+            if len(cols) == 2:
+                infobox_data[cols[0].get_text(strip=True)] = self._infobox_row_value(cols[1])
+        return infobox_data
 
-        def get_title(text: str) -> str | None:
-            text = text.strip()
-            keywords = ["演唱", "作词", "作曲", "编曲", "作编曲", "PV", "UP主", "曲绘"]
-            for kw in keywords:
-                if kw in text:
-                    return kw
-            return None
+    def _extract_infobox_single_col(self, infobox_table) -> Dict[str, str]:
+        """页面主信息框：除两列行外，还有 “标题行 + 内容行” 成对出现的单列行。"""
+        infobox_data = {}
+        preserved_title = None
+        title_findall = _INFOBOX_TITLE_RE.findall
+        keyword_priority = INFOBOX_TITLE_KEYWORDS.index
 
-        for row in rows:
+        for row in infobox_table.find_all('tr'):
             if 'display:none' in row.get('style', ''):
                 continue
-                
+
             cols = row.find_all(['th', 'td'])
-            
-            if len(cols) == 2:
-                key = cols[0].get_text(strip=True)
-                val_col = cols[1]
-                for br in val_col.find_all('br'):
-                    br.replace_with(',')
-                value = val_col.get_text(strip=True)
-                infobox_data[key] = value
-
-            elif len(cols) == 1 and single_col:
+            n_cols = len(cols)
+
+            if n_cols == 2:
+                infobox_data[cols[0].get_text(strip=True)] = self._infobox_row_value(cols[1])
+
+            elif n_cols == 1:
                 col = cols[0]
                 if 'infobox-image-container' in col.get('class', []):
                     continue
-                    
+
                 text = col.get_text(strip=True)
                 if not text:
                     continue
                 if preserved_title is None:
-                    preserved_title = get_title(text)
+                    matches = title_findall(text)
+                    preserved_title = min(matches, key=keyword_priority) if matches else None
                 else:
-                    key = preserved_title
-                    value = text
+                    infobox_data[preserved_title] = text
                     preserved_title = None
-                    infobox_data[key] = value
-                
+
         return infobox_data
 
     def _parse_page(self, html: str, title: str) -> Dict[str, Any]:
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = parse_content_soup(html)
         
         infobox_data = {}
         infobox_table = soup.find('table', class_='moe-infobox infobox')
         
         if infobox_table:
-            new_infobox_data = self._get_data_from_infobox(infobox_table, single_col=True)
+            new_infobox_data = self._extract_infobox_single_col(infobox_table)
             infobox_data.update(new_infobox_data)
 
         summary_parts = []
         summary: List[str] = []
-        short_summary: List[str] = []
         intro_header = []
         lyc_header = None
-        for h2 in soup.find_all('h2'):
+        headers = soup.find_all('h2')
+        for h2 in headers:
             text = h2.get_text()
             if '简介' in text or "VOCALOID原创作者" in text:
                 intro_header.append(h2) # 可能有重制版，因此会有多个简介
             elif "歌词" in text:
                 lyc_header = h2
         if not intro_header:
-            intro_header = soup.find('h2')
+            intro_header = headers[:1] # 没有简介标题时退回第一个 h2，复用已收集的结果而不再遍历文档
         
         if intro_header:
             def process_text(name: str, text: str, summary_parts: List[str], last_was_a: bool) -> bool:
                 if not text:
                     return last_was_a
                 # 删除以“截至”开头、以“收藏”结尾的统计句段
-                text = re.sub(r"截至[^。！？\n]*?收藏", "", text).strip()
+                text = _STAT_SENTENCE_RE.sub("", text).strip()
                 if summary_parts and (last_was_a or name == 'a'):
                     summary_parts[-1] += text
                 else:
@@ -215,25 +334,25 @@ class VCPediaFetcher:
                 summary_parts = []
                 last_was_a = False
                 for sibling in header.next_siblings:
-                    if sibling.name == 'h2' or sibling.name == 'h3':
+                    name = sibling.name
+                    if name == 'h2' or name == 'h3':
                         break
-                    if sibling.name in ['p', None, 'a']:
+                    if name in ('p', None, 'a'):
                         text = sibling.get_text(strip=True)
-                        last_was_a = process_text(sibling.name, text, summary_parts, last_was_a)
+                        last_was_a = process_text(name, text, summary_parts, last_was_a)
 
-                    elif sibling.name in ['ul', 'ol']:
+                    elif name in ('ul', 'ol'):
                         for li in sibling.find_all('li'):
                             text = li.get_text(strip=True)
                             last_was_a = process_text('li', text, summary_parts, last_was_a)
 
-                    elif sibling.name == 'div':
+                    elif name == 'div':
                         table = sibling.find('table')
                         if table:
-                            new_infobox_data = self._get_data_from_infobox(table, single_col=True)
+                            new_infobox_data = self._extract_infobox_single_col(table)
                             infobox_data.update(new_infobox_data)
 
                 summary.append("\n".join(summary_parts))
-                short_summary.append("\n".join(summary[-1].split("\n")[:3])) # 取前100字作为简短摘要
 
         if lyc_header :
             type = "Song"
@@ -268,11 +387,7 @@ class VCPediaFetcher:
                 if p_tag:
                     span_tags = p_tag.find_all('span')
                     if span_tags:
-                        for span in span_tags:
-                            if span is None:
-                                continue
-                            lyrics += span.get_text() + " "
-                        # lyrics = "".join([span.get_text() for span in span_tags])
+                        lyrics = " ".join(span.get_text() for span in span_tags)
                     else:
                         lyrics = p_tag.get_text()
                     lyrics = lyrics.replace('\u3000', ' ')
@@ -281,7 +396,7 @@ class VCPediaFetcher:
                     # collapse whitespace
                     lyrics = re.sub(r'\s+', ' ', lyrics).strip()
             if new_table:
-                new_infobox_data = self._get_data_from_infobox(new_table, single_col=False)
+                new_infobox_data = self._get_data_from_infobox(new_table)
                 infobox_data.update(new_infobox_data)
 
         return {
@@ -298,12 +413,11 @@ class VCPediaFetcher:
         
         save_dir.mkdir(parents=True, exist_ok=True)
         
-        safe_title = "".join([c for c in data['name'] if c.isalnum() or c in (' ', '-', '_')]).strip()
+        safe_title = safe_entity_name(data['name'])
         file_path = save_dir / f"{safe_title}.json"
         
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            file_path.write_bytes(json_dumps_bytes(data, indent=True))
             self.logger.info(f"Saved {data['name']} to {file_path}")
         except Exception as e:
             self.logger.error(f"Error saving data to {file_path}: {e}")
@@ -1,8 +1,11 @@
 """Speech capability integration tests."""
 
+import asyncio
 import base64
 import os
+import queue
 import sys
+import threading
 from pathlib import Path
 
 import pytest
@@ -11,7 +14,10 @@ server_root = str(Path(__file__).resolve().parent.parent)
 if server_root not in sys.path:
     sys.path.insert(0, server_root)
 
+from src.agent.main_chat import OneSentenceChat
 from src.capabilities.speech import SpeechCapability
+from src.capabilities.speech.tts_server import TTSServer
+from src.chat_session.dependency.global_speaking_worker import GlobalSpeakingWorker, SpeakingJob
 from src.utils.helpers import load_config
 
 
@@ -82,3 +88,112 @@ def test_tts_say_stream_returns_non_empty_audio_chunks(speech_capability):
     assert chunks, "streaming TTS should yield at least one audio chunk"
     decoded_chunks = [_assert_base64_audio(chunk) for chunk in chunks]
     assert sum(len(chunk) for chunk in decoded_chunks) > 1024
+
+
+class _FakeProcess:
+    def __init__(self):
+        self.alive = True
+
+    def is_alive(self):
+        return self.alive
+
+
+def test_tts_server_routes_out_of_order_responses_to_waiting_callers():
+    server = TTSServer(config_path="unused.yaml")
+    process = _FakeProcess()
+    stop_event = threading.Event()
+    server.server_process = process
+    server.request_queue = queue.Queue()
+    server.response_queue = queue.Queue()
+    dispatcher = threading.Thread(
+        target=server._dispatch_responses,
+        args=(process, server.response_queue, stop_event),
+        daemon=True,
+    )
+    dispatcher.start()
+
+    results = {}
+
+    def call(text):
+        results[text] = server.synthesize(text, "spk.wav", "prompt.wav", "prompt", timeout=5)
+
+    callers = [threading.Thread(target=call, args=(text,)) for text in ("a", "b")]
+    for caller in callers:
+        caller.start()
+    requests = [server.request_queue.get(timeout=5) for _ in callers]
+
+    # 按提交的逆序回包，调用方仍应各自拿到自己的音频
+    for request in reversed(requests):
+        server.response_queue.put(
+            {"request_id": request["request_id"], "ok": True, "audio_bytes": request["text"].encode()}
+        )
+    for caller in callers:
+        caller.join(timeout=5)
+    assert results == {"a": b"a", "b": b"b"}
+    assert server._pending == {}
+
+    # worker 异常退出时，等待中的调用方应立即失败而不是等到超时
+    def call_expect_failure():
+        with pytest.raises(RuntimeError) as exc_info:
+            call("c")
+        results["c"] = str(exc_info.value)
+
+    waiter = threading.Thread(target=call_expect_failure)
+    waiter.start()
+    server.request_queue.get(timeout=5)
+    process.alive = False
+    dispatcher.join(timeout=5)
+    waiter.join(timeout=5)
+    assert "exited unexpectedly" in results["c"]
+
+
+class _FakeSpeech:
+    def __init__(self):
+        self.started = []
+
+    def say_stream(self, character_id, text, tone):
+        self.started.append(text)
+        yield f"{text}-1"
+        yield f"{text}-2"
+
+
+class _FakeCapabilities:
+    def __init__(self):
+        self.speech = _FakeSpeech()
+
+
+@pytest.mark.asyncio
+async def test_speaking_worker_prefetches_next_sentence_and_keeps_order():
+    worker = GlobalSpeakingWorker({})
+    worker.set_capabilities(_FakeCapabilities())
+    sent = []
+    first_sentence_sent = asyncio.Event()
+    release_first_sentence = asyncio.Event()
+
+    async def send(resp):
+        sent.append((resp.uuid, resp.audio, resp.is_final_package))
+        if resp.uuid == "s1":
+            first_sentence_sent.set()
+            await release_first_sentence.wait()
+
+    for uuid in ("s1", "s2"):
+        await worker.enqueue(SpeakingJob(send, OneSentenceChat(content=uuid, uuid=uuid, tone="normal")))
+
+    try:
+        await asyncio.wait_for(first_sentence_sent.wait(), timeout=5)
+        # 第一句还卡在发送时，第二句的 TTS 已经开始
+        for _ in range(50):
+            if len(worker.capabilities.speech.started) == 2:
+                break
+            await asyncio.sleep(0.01)
+        assert worker.capabilities.speech.started == ["s1", "s2"]
+        assert all(uuid == "s1" for uuid, _, _ in sent)
+
+        release_first_sentence.set()
+        await asyncio.wait_for(worker.queue.join(), timeout=5)
+        assert sent == [
+            ("s1", "s1-1", False), ("s1", "s1-2", False), ("s1", "", True),
+            ("s2", "s2-1", False), ("s2", "s2-2", False), ("s2", "", True),
+        ]
+    finally:
+        await worker.stop()
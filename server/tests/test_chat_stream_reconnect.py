@@ -1,7 +1,10 @@
+import asyncio
 import sys
 from pathlib import Path
 from types import SimpleNamespace
 
+import pytest
+
 server_root = str(Path(__file__).resolve().parent.parent)
 if server_root not in sys.path:
     sys.path.insert(0, server_root)
@@ -18,3 +21,41 @@ def test_set_system_runtime_does_not_require_live_websocket_after_disconnect():
 
     assert stream.system_runtime is not None
     assert stream.ws_connection is None
+
+
+@pytest.mark.asyncio
+async def test_reflection_stages_wait_while_topic_replier_is_busy():
+    ws_connection = SimpleNamespace(user_name="tester", user_uuid="user-1", websocket=object())
+    stream = ChatStream({}, ws_connection, character_id="luotianyi")
+    worker = stream.reflection_worker
+    assert worker.foreground_idle is stream.topic_replier.idle_event
+
+    stages = []
+
+    async def record(name, turn):
+        stages.append(name)
+
+    worker._process_date_detection = lambda turn: record("date", turn)
+    worker._write_topic_memories = lambda turn: record("memory", turn)
+    worker._compress_context_and_update_profile = lambda turn: record("compress", turn)
+
+    stream.topic_replier.idle_event.clear()
+    reflection = asyncio.create_task(worker._reflect_completed_turn(SimpleNamespace()))
+    await asyncio.sleep(0.05)
+    assert stages == []
+
+    stream.topic_replier.idle_event.set()
+    await asyncio.wait_for(reflection, timeout=1)
+    assert stages == ["date", "memory", "compress"]
+
+
+@pytest.mark.asyncio
+async def test_topic_replier_is_busy_as_soon_as_a_topic_is_queued():
+    ws_connection = SimpleNamespace(user_name="tester", user_uuid="user-1", websocket=object())
+    replier = ChatStream({}, ws_connection, character_id="luotianyi").topic_replier
+    assert replier.idle_event.is_set()
+
+    # 处理协程尚未启动，topic 仍在队列中时就应视为忙碌
+    await replier.add_topic(SimpleNamespace(topic_content="你好", source_event_type=None))
+    assert not replier.idle_event.is_set()
+    assert replier.topic_queue.qsize() == 1
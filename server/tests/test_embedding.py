@@ -0,0 +1,100 @@
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+server_root = str(Path(__file__).resolve().parent.parent)
+if server_root not in sys.path:
+    sys.path.insert(0, server_root)
+
+from src.utils.llm import embedding as embedding_module
+from src.utils.llm.embedding import SiliconFlowEmbeddings
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, data=None, headers=None):
+        self.status_code = status_code
+        self._data = data
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+    def json(self):
+        return {"data": self._data}
+
+
+class FakeSession:
+    """记录请求的 Session 替身；每条文本的向量为 [len(text)]，接口按逆序返回 data。"""
+
+    def __init__(self, failures=None, stagger=False):
+        self.calls = []
+        self.failures = list(failures or [])
+        self.stagger = stagger
+
+    def post(self, url, headers=None, json=None, timeout=None):
+        self.calls.append(list(json["input"]))
+        if self.failures:
+            return self.failures.pop(0)
+        if self.stagger:
+            # 前面的批次更慢返回，验证并发结果按输入顺序拼回
+            time.sleep(0.01 * max(0, 4 - len(self.calls)))
+        data = [{"index": i, "embedding": [float(len(text))]} for i, text in enumerate(json["input"])]
+        return FakeResponse(data=list(reversed(data)))
+
+
+def _as_lists(vectors):
+    return [vector.tolist() for vector in vectors]
+
+
+def _make_embeddings(session, **kwargs):
+    embeddings = SiliconFlowEmbeddings(api_key="test-key", **kwargs)
+    embeddings.session = session
+    return embeddings
+
+
+def test_embed_documents_batches_requests_and_keeps_order():
+    session = FakeSession(stagger=True)
+    embeddings = _make_embeddings(session, batch_size=2)
+    texts = ["a", "bb", "ccc", "dddd", "eeeee"]
+
+    # 批次并发发出，返回顺序仍与输入一致
+    result = embeddings(texts)
+    assert all(vector.dtype == np.float32 for vector in result)
+    assert _as_lists(result) == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+    assert sorted(session.calls) == [["a", "bb"], ["ccc", "dddd"], ["eeeee"]]
+    assert embeddings.embed_query("xyz").tolist() == [3.0]
+
+
+def test_embed_batch_retries_rate_limit_with_retry_after(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(embedding_module.time, "sleep", sleeps.append)
+    monkeypatch.setattr(embedding_module.random, "uniform", lambda a, b: 0.0)
+    session = FakeSession(failures=[FakeResponse(429, headers={"Retry-After": "2"}), FakeResponse(503)])
+    embeddings = _make_embeddings(session)
+
+    assert _as_lists(embeddings.embed_documents(["hi"])) == [[2.0]]
+    assert len(session.calls) == 3
+    assert sleeps == [2.0, 1.0]
+
+
+def test_embedding_cache_skips_known_texts_across_instances(tmp_path):
+    cache_path = str(tmp_path / "embedding_cache.sqlite3")
+    session = FakeSession()
+    embeddings = _make_embeddings(session, cache_path=cache_path)
+
+    assert _as_lists(embeddings(["a", "bb", "a"])) == [[1.0], [2.0], [1.0]]
+    assert session.calls == [["a", "bb"]]
+
+    # 新实例（例如重新构建知识库）只请求未缓存的文本
+    rebuilt_session = FakeSession()
+    rebuilt = _make_embeddings(rebuilt_session, cache_path=cache_path)
+    assert _as_lists(rebuilt(["bb", "ccc", "a"])) == [[2.0], [3.0], [1.0]]
+    assert rebuilt_session.calls == [["ccc"]]
+
+    # 换模型后缓存键不同，不会误用旧向量
+    other_model = _make_embeddings(FakeSession(), cache_path=cache_path, model="other-model")
+    other_model(["a"])
+    assert other_model.session.calls == [["a"]]
@@ -0,0 +1,133 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+server_root = str(Path(__file__).resolve().parent.parent)
+if server_root not in sys.path:
+    sys.path.insert(0, server_root)
+
+from src.domain.memory_type import Entity, GraphEntityType, GraphRelationType
+from src.subconscious.memory.graph_retriever import InMemoryGraphRetriever
+from src.system.database.knowledge_graph import KnowledgeGraph, coerce_relation_type
+
+
+def _make_graph(tmp_path) -> KnowledgeGraph:
+    data = {
+        "entities": [
+            {"id": "洛天依", "name": "洛天依", "type": "Singer", "properties": {}},
+            {"id": "ilem", "name": "ilem", "type": "Person", "properties": {}},
+            {"id": "普通disco", "name": "普通disco", "type": "Song", "properties": {}},
+            {"id": "达拉崩吧", "name": "达拉崩吧", "type": "Song", "properties": {}},
+        ],
+        "relations": [
+            {"id": "r1", "source": "普通disco", "target": "洛天依", "type": "sung_by", "properties": {}},
+            {"id": "r2", "source": "普通disco", "target": "ilem", "type": "composed_by", "properties": {}},
+            {"id": "r3", "source": "达拉崩吧", "target": "洛天依", "type": "sung_by", "properties": {}},
+        ],
+    }
+    (tmp_path / "knowledge_graph.json").write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    (tmp_path / "alias.json").write_text("{}", encoding="utf-8")
+    return KnowledgeGraph({"graph_data_dir": str(tmp_path)})
+
+
+def test_entities_by_type_index_keeps_insertion_order(tmp_path):
+    kg = _make_graph(tmp_path)
+
+    songs = kg.get_entities_by_type(GraphEntityType.SONG)
+    assert [e.id for e in songs] == ["普通disco", "达拉崩吧"]
+    assert [e.id for e in kg.get_entities_by_type("Person")] == ["ilem"]
+    assert kg.get_entities_by_type(GraphEntityType.ALBUM) == []
+
+    kg.update_entity(Entity(id="ilem", name="ilem", entity_type=GraphEntityType.SINGER, properties={}))
+    assert kg.get_entities_by_type("Person") == []
+    assert [e.id for e in kg.get_entities_by_type("Singer")] == ["洛天依", "ilem"]
+
+
+def test_update_entity_reindexes_in_place_mutation(tmp_path):
+    kg = _make_graph(tmp_path)
+
+    entity = kg.entities["ilem"]
+    entity.entity_type = GraphEntityType.SINGER
+    entity.name = "ilem2"
+    kg.update_entity(entity)
+
+    assert kg.get_entities_by_type("Person") == []
+    assert [e.id for e in kg.get_entities_by_type("Singer")] == ["洛天依", "ilem"]
+    assert kg.get_entity_by_name("ilem") is None
+    assert kg.get_entity_by_name("ilem2").id == "ilem"
+    assert kg.graph.nodes["ilem"]["name"] == "ilem2"
+
+
+def test_find_entity_by_name_uses_index_and_follows_renames(tmp_path):
+    kg = _make_graph(tmp_path)
+    retriever = InMemoryGraphRetriever({})
+
+    assert retriever._find_entity_by_name(kg, "达拉崩吧").id == "达拉崩吧"
+    assert retriever._find_entity_by_name(kg, "不存在") is None
+
+    kg.update_entity(Entity(id="达拉崩吧", name="达拉崩吧2", entity_type=GraphEntityType.SONG, properties={}))
+    assert retriever._find_entity_by_name(kg, "达拉崩吧") is None
+    assert retriever._find_entity_by_name(kg, "达拉崩吧2").id == "达拉崩吧"
+
+    results = retriever.retrieve(kg, "", ["普通disco"])
+    assert {(r["target_entity"], r["relation"]) for r in results} == {
+        ("洛天依", GraphRelationType.SUNG_BY.value),
+        ("ilem", GraphRelationType.COMPOSED_BY.value),
+    }
+
+
+def test_get_neighbors_directions_and_filters(tmp_path):
+    kg = _make_graph(tmp_path)
+
+    incoming = kg.get_neighbors("洛天依", direction="incoming")
+    assert [(e.id, r) for e, r in incoming] == [("普通disco", "<-sung_by"), ("达拉崩吧", "<-sung_by")]
+
+    outgoing = kg.get_neighbors("普通disco", direction="outgoing", neighbor_type=GraphEntityType.PERSON)
+    assert [(e.id, r) for e, r in outgoing] == [("ilem", "composed_by")]
+
+    both = kg.get_neighbors("普通disco", direction="both", relation_type=GraphRelationType.SUNG_BY)
+    assert [(e.id, r) for e, r in both] == [("洛天依", "sung_by")]
+    assert kg.get_neighbors("不存在") == []
+
+
+def test_relation_between_entities_uses_cached_type_coercion(tmp_path):
+    kg = _make_graph(tmp_path)
+    retriever = InMemoryGraphRetriever({})
+
+    relations = retriever.retrieve_relation_between_entities(kg, "洛天依", "普通disco")
+    assert [(r.source_id, r.target_id, r.relation_type) for r in relations] == [
+        ("普通disco", "洛天依", GraphRelationType.SUNG_BY)
+    ]
+    assert coerce_relation_type("sung_by") is GraphRelationType.SUNG_BY
+    assert coerce_relation_type(GraphRelationType.SUNG_BY) is GraphRelationType.SUNG_BY
+    with pytest.raises(ValueError):
+        coerce_relation_type("not_a_relation")
+
+
+def test_unchanged_updates_do_not_dirty_graph_or_rewrite_file(tmp_path):
+    kg = _make_graph(tmp_path)
+    data_file = tmp_path / "knowledge_graph.json"
+    data_file.write_text("sentinel", encoding="utf-8")
+
+    entity = kg.entities["ilem"]
+    kg.update_entity(Entity(id="ilem", name="ilem", entity_type=GraphEntityType.PERSON, properties={}))
+    kg.save_graph_data()
+    assert data_file.read_text(encoding="utf-8") == "sentinel"
+
+    # 原地修改后再传回同一对象，也要能识别出改动
+    entity.properties["summary"] = "作曲家"
+    kg.update_entity(entity)
+    assert kg.graph.nodes["ilem"]["summary"] == "作曲家"
+    kg.save_graph_data()
+    saved = json.loads(data_file.read_text(encoding="utf-8"))
+    assert {"id": "ilem", "name": "ilem", "type": "Person", "properties": {"summary": "作曲家"}} in saved["entities"]
+
+
+def test_find_connections_describes_relations_by_value(tmp_path):
+    kg = _make_graph(tmp_path)
+    retriever = InMemoryGraphRetriever({})
+
+    paths = retriever.find_connections(kg, "ilem", "达拉崩吧")
+    assert paths == ["ilem <--[composed_by]-- 普通disco , 普通disco --[sung_by]--> 洛天依 , 洛天依 <--[sung_by]-- 达拉崩吧"]
@@ -1,15 +1,33 @@
 """LLM Service 单元测试"""
+import asyncio
+import json
 import sys
 import os
 from pathlib import Path
+from types import SimpleNamespace
 import pytest
 # 添加项目根目录
 server_root = str(Path(__file__).resolve().parent.parent)
 if server_root not in sys.path:
     sys.path.insert(0, server_root)
 
+from src.agent.main_chat import MainChat, OneSentenceChat, SongSegmentChat
+from src.agent.prompt_assembly import RealizationPromptAssembler
+from src.agent.response_parser import StructuredResponseParser
+from src.utils.llm import llm_api_interface
+from src.utils.llm.llm_api_interface import (
+    ExponentialBackoff,
+    LLMAPIFactory,
+    LLMAPIInterface,
+    LoadBalancedAPIInterface,
+    OpenAIAPIInterface,
+    RequestsAPIInterface,
+)
+from src.utils.llm.llm_module import LLMModule
+from src.utils.llm.prompt_manager import PromptManager, PromptTemplate
 from src.utils.llm_service import LLMService
 from src.utils.helpers import load_config
+from src.utils.logger import get_logger
 
 
 @pytest.fixture(scope="module", autouse=True)
@@ -129,3 +147,345 @@ class TestLLMService:
         assert "total_tokens" in token_usage and token_usage["total_tokens"] > 0, "最近一次响应的使用情况中缺少 'total_tokens'"
         response_time_s = recent_resp.get("response_time_s", None)
         assert response_time_s is not None, "最近一次响应的使用情况中缺少 'response_time_s'"
+
+
+class _ChunkedInterface(LLMAPIInterface):
+    """按给定分片流式返回的接口替身，分片边界故意落在行中间。"""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def generate_response(self, prompt, params, enable_thinking=False, use_json=False, **kwargs):
+        return {"content": "".join(self.chunks), "usage": {}, "response_time_s": 0.0}
+
+    async def generate_response_stream(self, prompt, params, enable_thinking=False, use_json=False, **kwargs):
+        for chunk in self.chunks:
+            yield chunk
+
+    def set_parameters(self, **params):
+        pass
+
+    def get_interface_info(self):
+        return {}
+
+
+class _OneShotInterface(_ChunkedInterface):
+    generate_response_stream = LLMAPIInterface.generate_response_stream
+
+
+def _make_streaming_main_chat(interface):
+    template = PromptTemplate("{{ reply_topic }}", ["reply_topic"], "stream_test")
+    main_chat = MainChat.__new__(MainChat)
+    main_chat.logger = get_logger("test_main_chat_stream")
+    main_chat.llm = LLMModule("stream_test", {}, template, interface)
+    main_chat.character_name = "洛天依"
+    main_chat.character_persona = ""
+    main_chat.speaking_style = ""
+    main_chat.default_response = OneSentenceChat(content="")
+    main_chat.prompt_assembler = RealizationPromptAssembler()
+    main_chat.response_parser = StructuredResponseParser(
+        sentence_cls=OneSentenceChat,
+        song_cls=SongSegmentChat,
+        default_response=main_chat.default_response,
+        tone_mapper=lambda tone: (f"expr-{tone}", f"tts-{tone}"),
+    )
+    return main_chat
+
+
+@pytest.mark.asyncio
+async def test_main_chat_stream_yields_each_line_as_it_completes():
+    chunks = ["[开心]你好", "呀\n[平静]今天", "天气不错\n", "[sing] 普通disco\n[开心]再见"]
+    main_chat = _make_streaming_main_chat(_ChunkedInterface(chunks))
+
+    stream = main_chat.generate_response_stream(
+        reply_topic="打招呼", user_nickname="你", user_description="", sing_plan=("普通disco", "副歌")
+    )
+    first = await stream.__anext__()
+    # 第一行在第二个分片到达时就已产出，不必等整段回复
+    assert first.content == "你好呀" and first.tone == "tts-开心"
+    rest = [item async for item in stream]
+
+    assert [getattr(item, "content", None) or item.song for item in rest] == ["今天天气不错", "普通disco", "再见"]
+    assert isinstance(rest[1], SongSegmentChat) and rest[1].segment == "副歌"
+    assert main_chat.llm.recent_response["content"] == "".join(chunks)
+
+    batch = await main_chat.generate_response(reply_topic="打招呼", user_nickname="你", user_description="", sing_plan=("普通disco", "副歌"))
+    assert [item.get_content() for item in batch] == [first.get_content()] + [item.get_content() for item in rest]
+
+
+@pytest.mark.asyncio
+async def test_main_chat_stream_falls_back_for_non_streaming_interface():
+    main_chat = _make_streaming_main_chat(_OneShotInterface(["没有格式的回复"]))
+
+    items = [item async for item in main_chat.generate_response_stream(reply_topic="x", user_nickname="你", user_description="")]
+
+    assert items == [main_chat.default_response]
+
+
+class _CountingCompletions:
+    def __init__(self):
+        self.calls = 0
+
+    def create(self, messages, model, **kwargs):
+        self.calls += 1
+        message = SimpleNamespace(content=f"reply-{self.calls}")
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=message)],
+            usage=SimpleNamespace(prompt_tokens=3, completion_tokens=2, total_tokens=5),
+        )
+
+
+@pytest.mark.asyncio
+async def test_exact_response_cache_only_serves_deterministic_requests():
+    interface = OpenAIAPIInterface({"api_key": "test-key", "model": "test-model", "response_cache_size": 2})
+    completions = _CountingCompletions()
+    interface.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+    first = await interface.generate_response("同一个 prompt", params={"temperature": 0})
+    cached = await interface.generate_response("同一个 prompt", params={"temperature": 0})
+    assert completions.calls == 1
+    assert cached["content"] == first["content"] == "reply-1"
+    assert cached["usage"]["total_tokens"] == 0
+
+    # 有随机性的请求不走缓存
+    await interface.generate_response("同一个 prompt", params={"temperature": 0.7})
+    await interface.generate_response("同一个 prompt", params={"temperature": 0.7})
+    assert completions.calls == 3
+
+    # 超出容量时淘汰最久未使用的条目
+    await interface.generate_response("prompt-2", params={"temperature": 0})
+    await interface.generate_response("prompt-3", params={"temperature": 0})
+    await interface.generate_response("同一个 prompt", params={"temperature": 0})
+    assert completions.calls == 6
+
+
+@pytest.mark.asyncio
+async def test_generate_batch_bounds_concurrency_and_keeps_order():
+    class _SlowInterface(_ChunkedInterface):
+        def __init__(self):
+            super().__init__([])
+            self.active = 0
+            self.peak = 0
+
+        async def generate_response(self, prompt, params, enable_thinking=False, use_json=False, **kwargs):
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            await asyncio.sleep(0.01 * (5 - int(prompt)))
+            self.active -= 1
+            if prompt == "3":
+                raise RuntimeError("boom")
+            return {"content": f"reply-{prompt}", "usage": {}, "response_time_s": 0.0}
+
+    interface = _SlowInterface()
+    results = await interface.generate_batch([str(i) for i in range(5)], params={}, max_concurrency=2)
+
+    assert [r["content"] if isinstance(r, dict) else type(r) for r in results] == [
+        "reply-0", "reply-1", "reply-2", RuntimeError, "reply-4"
+    ]
+    assert interface.peak == 2
+
+
+@pytest.mark.asyncio
+async def test_load_balanced_interface_routes_to_least_busy_child():
+    balancer = LLMAPIFactory.create_interface({
+        "api_type": "load_balanced",
+        "children": [
+            {"api_type": "openai", "api_key": "key-a", "model": "m"},
+            {"api_type": "openai", "api_key": "key-b", "model": "m"},
+        ],
+    })
+    assert isinstance(balancer, LoadBalancedAPIInterface)
+
+    served = []
+
+    class _Completions:
+        def __init__(self, name):
+            self.name = name
+
+        def create(self, messages, model, **kwargs):
+            served.append(self.name)
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=self.name))], usage=None)
+
+    for child, name in zip(balancer.children, ["a", "b"]):
+        child.client = SimpleNamespace(chat=SimpleNamespace(completions=_Completions(name)))
+
+    # 子接口 a 上挂着一个进行中的请求时，新请求都交给 b
+    busy = balancer._acquire()
+    assert busy == 0
+    await balancer.generate_response("p", params={})
+    await balancer.generate_response("p", params={})
+    balancer._release(busy)
+    # 都空闲时轮转
+    await balancer.generate_response("p", params={})
+    await balancer.generate_response("p", params={})
+
+    assert served == ["b", "b", "a", "b"]
+    assert balancer._inflight == [0, 0]
+
+
+def test_backoff_is_capped_jittered_and_honours_retry_after(monkeypatch):
+    backoff = ExponentialBackoff(base=0.5, max_delay=3.0, jitter_pct=0.25)
+    delays = [backoff.delay(attempt) for attempt in range(6)]
+    assert 0.375 <= delays[0] <= 0.625
+    assert all(d <= 3.0 * 1.25 for d in delays)
+    assert delays[5] >= 3.0 * 0.75
+
+    rate_limited = RuntimeError("429")
+    rate_limited.response = SimpleNamespace(headers={"Retry-After": "7"})
+    assert backoff.delay(0, rate_limited) == 7.0
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_is_shared_per_key_and_paces_requests(monkeypatch):
+    monkeypatch.setattr(llm_api_interface, "_token_buckets", {})
+    config = {"api_key": "k", "requests_per_minute": 600, "rate_limit_burst": 2}
+    first = OpenAIAPIInterface({**config, "model": "a"})
+    second = OpenAIAPIInterface({**config, "model": "b"})
+    assert first.token_bucket is second.token_bucket
+    assert OpenAIAPIInterface({"api_key": "k"}).token_bucket is None
+
+    sleeps = []
+
+    async def _fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr(llm_api_interface.asyncio, "sleep", _fake_sleep)
+    for _ in range(4):
+        await first.token_bucket.acquire()
+    # 桶容量 2，之后每个请求按 10 req/s 预约，等待时间依次递增
+    assert len(sleeps) == 2
+    assert sleeps[0] == pytest.approx(0.1, abs=0.02)
+    assert sleeps[1] == pytest.approx(0.2, abs=0.02)
+
+
+def test_prompt_manager_extracts_variables_from_jinja_blocks():
+    manager = PromptManager({})
+    manager.add_template_from_str(
+        "blocks",
+        "{% if mood %}{{ name | default(fallback) }}{% endif %}{% for item in items %}{{ item.title }}{% endfor %}",
+    )
+    assert manager.get_template_info("blocks")["variables"] == ["fallback", "items", "mood", "name"]
+
+
+@pytest.mark.asyncio
+async def test_requests_interface_sends_preencoded_body_without_mutating_payload():
+    interface = RequestsAPIInterface({"api_key": "k", "url": "http://llm.test/v1/chat/completions", "temperature": 0})
+    sent = []
+
+    class _Response:
+        def raise_for_status(self):
+            pass
+
+        content = json.dumps({"choices": [{"message": {"content": "ok"}}], "usage": {}}).encode()
+
+    def _post(url, headers=None, data=None, timeout=None):
+        sent.append(json.loads(data))
+        return _Response()
+
+    interface.session = SimpleNamespace(post=_post)
+    await interface.generate_response("你好", use_json=True)
+    await interface.generate_response("再见")
+
+    assert sent[0]["messages"] == [{"role": "user", "content": "你好"}]
+    assert sent[0]["response_format"] == {"type": "json_object"}
+    assert sent[0]["model"] == interface.model and sent[0]["temperature"] == 0
+    # use_json 只作用于本次请求，共享的 payload 也不再被改写
+    assert "response_format" not in sent[1]
+    assert interface.payload["messages"] is None
+
+
+@pytest.mark.asyncio
+async def test_requests_interface_streams_sse_deltas():
+    interface = RequestsAPIInterface({"api_key": "k", "url": "http://llm.test/v1/chat/completions"})
+    sent = []
+
+    def _event(content):
+        return b"data: " + json.dumps({"choices": [{"delta": {"content": content}}]}).encode()
+
+    class _StreamResponse:
+        closed = False
+
+        def raise_for_status(self):
+            pass
+
+        def iter_lines(self):
+            return iter([_event("你"), b"", b": keep-alive", _event("好"), b"data: [DONE]", _event("ignored")])
+
+        def close(self):
+            _StreamResponse.closed = True
+
+    def _post(url, headers=None, data=None, timeout=None, stream=False):
+        sent.append((json.loads(data), stream))
+        return _StreamResponse()
+
+    interface.session = SimpleNamespace(post=_post)
+    chunks = [chunk async for chunk in interface.generate_response_stream("hi", params={})]
+
+    assert chunks == ["你", "好"]
+    assert sent[0][0]["stream"] is True and sent[0][1] is True
+    assert _StreamResponse.closed
+
+
+def test_factory_dispatches_registered_api_types(monkeypatch):
+    monkeypatch.setattr(llm_api_interface, "_API_REGISTRY", dict(llm_api_interface._API_REGISTRY))
+
+    @llm_api_interface.register_api_type("Fake")
+    class _FakeInterface(_ChunkedInterface):
+        def __init__(self, config):
+            super().__init__([])
+            self.config = config
+
+    created = LLMAPIFactory.create_interface({"api_type": "fake", "cache_client": False})
+    assert isinstance(created, _FakeInterface)
+    with pytest.raises(ValueError):
+        LLMAPIFactory.create_interface({"api_type": "missing", "cache_client": False})
+
+
+@pytest.mark.asyncio
+async def test_requests_interface_retries_only_rate_limits_and_server_errors(monkeypatch):
+    import requests
+
+    async def _no_sleep(delay):
+        pass
+
+    monkeypatch.setattr(llm_api_interface.asyncio, "sleep", _no_sleep)
+    interface = RequestsAPIInterface({"api_key": "k", "url": "http://llm.test/v1/chat/completions"})
+
+    def _session_returning(statuses):
+        calls = []
+
+        class _Response:
+            def __init__(self, status_code):
+                self.status_code = status_code
+                self.headers = {}
+                self.content = json.dumps({"choices": [{"message": {"content": "ok"}}], "usage": {}}).encode()
+
+            def raise_for_status(self):
+                if self.status_code >= 400:
+                    raise requests.HTTPError(f"HTTP {self.status_code}", response=self)
+
+            def iter_lines(self):
+                return iter([b"data: [DONE]"])
+
+            def close(self):
+                pass
+
+        def _post(url, headers=None, data=None, timeout=None, stream=False):
+            calls.append(statuses[len(calls)])
+            return _Response(calls[-1])
+
+        return SimpleNamespace(post=_post), calls
+
+    interface.session, calls = _session_returning([429, 503, 200])
+    assert (await interface.generate_response("hi"))["content"] == "ok"
+    assert calls == [429, 503, 200]
+
+    interface.session, calls = _session_returning([401, 200])
+    with pytest.raises(requests.HTTPError):
+        await interface.generate_response("hi")
+    assert calls == [401]
+
+    interface.session, calls = _session_returning([404, 200])
+    with pytest.raises(requests.HTTPError):
+        _ = [chunk async for chunk in interface.generate_response_stream("hi", params={})]
+    assert calls == [404]
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import os
 import sys
@@ -263,6 +264,43 @@ async def test_search_memory_context_reads_canonical_record_from_real_database(
     assert context.render_for_prompt() == [hit.rendered_text]
 
 
+class GatedVectorStore(InMemoryVectorStore):
+    """只有所有查询都已发出时才返回结果，用来确认召回是并发进行的。"""
+
+    def __init__(self, expected_queries):
+        super().__init__()
+        self.expected_queries = expected_queries
+        self.queries = []
+        self.all_started = asyncio.Event()
+
+    async def search(self, user_id, query, k=5, **kwargs):
+        self.queries.append(query)
+        if len(self.queries) == self.expected_queries:
+            self.all_started.set()
+        await asyncio.wait_for(self.all_started.wait(), timeout=1)
+        return await super().search(user_id, query, k=k, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_search_memory_context_issues_queries_concurrently(fake_memory):
+    vector_store = GatedVectorStore(expected_queries=2)
+    vector_store.add_seed_document("用户喜欢薄荷巧克力", {"user_id": USER_ID}, "vec-a")
+    vector_store.add_seed_document("用户养了一只橘猫", {"user_id": USER_ID}, "vec-b")
+    fake_memory.vector_store = vector_store
+
+    context = await fake_memory.search_memory_context_for_topic(
+        USER_ID,
+        ["薄荷巧克力", " 橘猫 ", "薄荷巧克力", ""],
+        similarity_threshold=0.8,
+        k=3,
+    )
+
+    # 重复和空白线索不会重复检索
+    assert sorted(vector_store.queries) == sorted(["薄荷巧克力", "橘猫"])
+    assert [hit.query for hit in context.hits] == ["薄荷巧克力", "橘猫"]
+    assert [hit.vector_id for hit in context.hits] == ["vec-a", "vec-b"]
+
+
 @pytest.mark.asyncio
 async def test_write_user_and_event_memory_records_vector_and_canonical_rows(fake_memory, fake_database_manager, fake_vector_store):
     """直接写入用户记忆和事件记忆，并验证向量与正本都被写入。"""
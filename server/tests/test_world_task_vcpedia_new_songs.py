@@ -120,3 +120,212 @@ def test_vcpedia_run_once_fetches_live_songs_and_writes_result(monkeypatch, tmp_
     assert payload["added_count"] == len(payload["added"])
     assert payload["failed_count"] == len(payload["failed"])
     assert payload["added"] or payload["failed"], f"No songs were fetched; see {OUTPUT_FILE}"
+
+
+def _offline_fetcher(tmp_path, monkeypatch, fetched):
+    from src.world.get_new_songs.vcpedia_fetcher import VCPediaFetcher
+
+    fetcher = VCPediaFetcher({
+        "activated": True,
+        "data_dir": str(tmp_path / "crawled_data"),
+        "vcpedia": {
+            "output_dir": str(tmp_path / "crawled_data"),
+            "max_requests_per_second": 1000,
+            "max_concurrency": 2,
+        },
+    })
+
+    def fake_fetch_page(page_name):
+        fetched.append(page_name)
+        return None if page_name == "missing" else f"<html>{page_name}</html>"
+
+    monkeypatch.setattr(fetcher, "_fetch_page", fake_fetch_page)
+    monkeypatch.setattr(fetcher, "_parse_page", lambda html, title: {"name": title, "type": "Person", "html": html})
+    return fetcher
+
+
+def test_vcpedia_fetcher_reuses_prefetched_pages(monkeypatch, tmp_path):
+    fetched = []
+    fetcher = _offline_fetcher(tmp_path, monkeypatch, fetched)
+
+    fetcher.prefetch_pages(["A", "B", "missing"])
+    assert sorted(fetched) == ["A", "B", "missing"]
+
+    assert fetcher.fetch_entity_description("A")["html"] == "<html>A</html>"
+    assert fetcher.fetch_entity_description("missing") is None
+    assert sorted(fetched) == ["A", "B", "missing"]
+
+
+def test_vcpedia_fetcher_serves_reruns_from_result_cache(monkeypatch, tmp_path):
+    fetched = []
+    fetcher = _offline_fetcher(tmp_path, monkeypatch, fetched)
+    assert fetcher.fetch_entity_description("A")["html"] == "<html>A</html>"
+    assert (tmp_path / "crawled_data" / "A.json").exists()
+
+    rerun = _offline_fetcher(tmp_path, monkeypatch, fetched)
+    rerun.prefetch_pages(["A"])
+    assert rerun.fetch_entity_description("A")["html"] == "<html>A</html>"
+    assert fetched == ["A"]
+
+    rerun.fetch_entity_description("A", use_cache=False)
+    assert fetched == ["A", "A"]
+
+
+def test_vcpedia_fetcher_recrawls_expired_cache_entries(monkeypatch, tmp_path):
+    import os
+    import time
+
+    fetched = []
+    _offline_fetcher(tmp_path, monkeypatch, fetched).fetch_entity_description("A")
+    cache_file = tmp_path / "crawled_data" / "A.json"
+    stale = time.time() - 2 * 86400
+    os.utime(cache_file, (stale, stale))
+
+    # 过期的缓存既不被预取跳过，也不被直接返回
+    rerun = _offline_fetcher(tmp_path, monkeypatch, fetched)
+    rerun.prefetch_pages(["A"])
+    assert fetched == ["A", "A"]
+    assert rerun.fetch_entity_description("A")["html"] == "<html>A</html>"
+    assert fetched == ["A", "A"]
+    assert cache_file.stat().st_mtime > stale
+
+    rerun.cache_max_age_seconds = 0
+    os.utime(cache_file, (stale, stale))
+    assert rerun._check_cache("A") is not None
+
+
+SAMPLE_SONG_PAGE = """<html><head><title>x</title></head><body>
+<div id="mw-navigation"><h2>导航</h2></div>
+<div id="mw-content-text"><div class="mw-parser-output">
+<table class="moe-infobox infobox">
+<tr><td class="infobox-image-container">img</td></tr>
+<tr><th>歌曲名称</th><td>示例歌<br>Example</td></tr>
+<tr style="display:none"><th>隐藏</th><td>x</td></tr>
+<tr><td>演唱</td></tr><tr><td>洛天依</td></tr>
+<tr><td>作编曲</td></tr><tr><td>某P</td></tr>
+</table>
+<h2><span>简介</span></h2>
+<p>《示例歌》是某P投稿的作品。截至2024年有10万收藏</p>
+<a href="/x">链接</a>后缀文本
+<ul><li>第一项</li><li>第二项</li></ul>
+<div><table><tr><td>UP主</td></tr><tr><td>某UP</td></tr></table></div>
+<h3>其他</h3>
+<p>不应包含</p>
+<h2>歌词</h2>
+<div><table class="wikitable"><tr><th>发行</th><td>2024</td></tr></table></div>
+<div class="poem"><p><span>第一句 [注 1]</span><span>第二句（和声）</span></p></div>
+<table class="navbox"><tr><td>nav</td></tr></table>
+</div></div>
+<div id="footer"><h2>页脚</h2></div>
+</body></html>
+"""
+
+
+def test_vcpedia_parse_page_extracts_song_fields():
+    from src.world.get_new_songs.vcpedia_fetcher import VCPediaFetcher
+
+    data = VCPediaFetcher({})._parse_page(SAMPLE_SONG_PAGE, "示例歌")
+
+    assert data["type"] == "Song"
+    assert data["infobox"] == {
+        "歌曲名称": "示例歌,Example",
+        "演唱": "洛天依",
+        "作编曲": "某P",
+        "UP主": "某UP",
+        "发行": "2024",
+    }
+    assert data["summary"] == ["《示例歌》是某P投稿的作品。链接后缀文本\n第一项\n第二项"]
+    assert data["lyrics"] == "第一句 第二句"
+
+
+def test_vcpedia_infobox_title_prefers_keyword_priority_over_position():
+    from bs4 import BeautifulSoup
+
+    from src.world.get_new_songs.vcpedia_fetcher import VCPediaFetcher
+
+    rows = "".join(
+        f"<tr><td>{title}</td></tr><tr><td>{value}</td></tr>"
+        for title, value in [("作曲·演唱", "洛天依"), ("曲绘·PV", "某画师"), ("作编曲", "某P")]
+    )
+    table = BeautifulSoup(f"<table>{rows}</table>", "html.parser").table
+
+    assert VCPediaFetcher({})._extract_infobox_single_col(table) == {"演唱": "洛天依", "PV": "某画师", "作编曲": "某P"}
+
+
+def test_vcpedia_parse_page_falls_back_to_first_header():
+    from src.world.get_new_songs.vcpedia_fetcher import VCPediaFetcher
+
+    html = "<html><body><h2>概述</h2><p>第一段</p><p>第二段</p><h2>相关</h2><p>无关</p></body></html>"
+    data = VCPediaFetcher({})._parse_page(html, "某人")
+
+    assert data["type"] == "Person"
+    assert data["summary"] == ["第一段\n第二段"]
+
+
+def test_vcpedia_prefetch_summarizes_songs_concurrently(monkeypatch, tmp_path):
+    import asyncio
+
+    class FakeLLM:
+        def __init__(self):
+            self.in_flight = 0
+            self.max_in_flight = 0
+
+        async def generate_response(self, song_data):
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(0.01)
+            self.in_flight -= 1
+            return "summary"
+
+    fetcher = _offline_fetcher(tmp_path, monkeypatch, [])
+    fetcher.use_llm = True
+    fetcher.llm_module = FakeLLM()
+    monkeypatch.setattr(fetcher, "_parse_page", lambda html, title: {"name": title, "type": "Song", "summary": ["s"]})
+
+    fetcher.prefetch_pages(["A", "B", "C"])
+
+    assert fetcher.llm_module.max_in_flight > 1
+    assert fetcher.fetch_entity_description("B")["short_summary"] == "summary"
+
+
+def test_sync_daily_new_songs_skips_existing_and_batches_keywords(monkeypatch, tmp_path):
+    from src.subconscious.music_knowledge.song_database import Song, get_song_session, init_song_db
+
+    db_cfg = {"db_folder": str(tmp_path / "knowledge"), "db_file": "knowledge_db.db"}
+    init_song_db(db_cfg)
+    db = get_song_session()
+    db.add(Song(name="已有", safe_name="已有", uploader="", singers="", introduction="x", lyrics=""))
+    db.commit()
+    db.close()
+
+    prefetched = []
+
+    class FakeFetcher:
+        def __init__(self, config, llm_module=None):
+            pass
+
+        def prefetch_pages(self, names):
+            prefetched.extend(names)
+
+        def fetch_entity_description(self, name, use_cache=True):
+            return {"infobox": {"UP主": "某P"}, "short_summary": "简介", "lyrics": "", "spaced_lyrics": "第一句歌词啊 第二句歌词啊"}
+
+        def close(self):
+            pass
+
+    keyword_dir = tmp_path / "keywords"
+    monkeypatch.setattr(fetcher_module, "KNOWLEDGE_DIR", keyword_dir)
+    monkeypatch.setattr(fetcher_module, "SONG_NAME_KEYWORDS_FILE", keyword_dir / "song_name_keywords.txt")
+    monkeypatch.setattr(fetcher_module, "SONG_LYRIC_KEYWORDS_FILE", keyword_dir / "song_lyric_keywords.txt")
+    monkeypatch.setattr(fetcher_module, "fetch_song_list_from_template", lambda url: ["已有", "新歌", "新歌?"])
+    monkeypatch.setattr(fetcher_module, "VCPediaFetcher", FakeFetcher)
+
+    result = fetcher_module.sync_daily_new_songs({"song_database": db_cfg, "crawler": {"activated": True}})
+
+    assert prefetched == ["新歌"]
+    assert result == {"added": ["新歌"], "failed": ["已有", "新歌?"]}
+    assert (keyword_dir / "song_name_keywords.txt").read_text(encoding="utf-8") == "新歌\n"
+    assert (keyword_dir / "song_lyric_keywords.txt").read_text(encoding="utf-8").splitlines() == [
+        "第一句歌词啊=>第一句歌词啊是《新歌》的歌词",
+        "第二句歌词啊=>第二句歌词啊是《新歌》的歌词",
+    ]